@@ -0,0 +1,178 @@
+import os
+import time
+import random
+from decimal import Decimal
+from botocore.exceptions import ClientError
+
+from cars_common import deadline, log, stats, version
+from cars_common.db import table, deserialize_item, transact_write
+
+# Logger JSON; el nivel sale de LOG_LEVEL
+logger = log.get_logger()
+
+# Consumidor del stream de CarsTable: mantiene las vistas derivadas de los carros
+# (contadores y top_potencia de stats#<tipo>, feed de cambios de la búsqueda) para
+# que los handlers de escritura hagan una sola escritura y no lean antes de escribir.
+#
+# Lambda entrega los registros de cada shard en orden y vuelve a entregar desde el
+# primero que se reporta en batchItemFailures, así que un registro puede aplicarse
+# más de una vez. Los contadores se suman en la misma transacción que la marca
+# applied#<id> con el SequenceNumber del registro: si la marca ya tiene uno igual o
+# posterior, el registro ya se aplicó. El feed y top_potencia son idempotentes.
+TOP_POTENCIA_INDEX_NAME = os.environ.get('TIPO_POTENCIA_INDEX_NAME', 'TipoPotenciaIndex')
+APPLIED_PREFIX = 'applied#'
+# Las marcas solo hacen falta mientras el registro pueda volver a entregarse (24 h de retención del stream)
+APPLIED_TTL_SECONDS = int(os.environ.get('APPLIED_TTL_SECONDS', str(48 * 3600)))
+# Los SequenceNumber son enteros de hasta 40 dígitos: con ceros a la izquierda se comparan como texto
+SEQUENCE_WIDTH = 40
+# Tiempo que se reserva al final de la invocación para el feed y top_potencia del lote
+VIEWS_RESERVE_SECONDS = float(os.environ.get('VIEWS_RESERVE_SECONDS', '3'))
+
+
+def applied_key(car_id):
+    return {'pk': APPLIED_PREFIX + car_id}
+
+
+def images(record):
+    """(imagen anterior, imagen nueva) del registro, None donde no hay carro."""
+    change = record['dynamodb']
+    old_image = change.get('OldImage')
+    new_image = change.get('NewImage')
+    return (
+        deserialize_item(old_image) if old_image else None,
+        deserialize_item(new_image) if new_image else None,
+    )
+
+
+def apply_counters(record, old_car, new_car):
+    """Suma el cambio del carro a los contadores; False si el registro ya se había aplicado."""
+    updates = stats.counter_updates(old_car, new_car)
+    if not updates:
+        return True
+    car_id = deserialize_item(record['dynamodb']['Keys'])['id']
+    marker = ('Update', version.meta_table, {
+        'Key': applied_key(car_id),
+        'UpdateExpression': 'SET #seq = :seq, expires_at = :expires_at',
+        'ConditionExpression': 'attribute_not_exists(#seq) OR #seq < :seq',
+        'ExpressionAttributeNames': {'#seq': 'seq'},
+        'ExpressionAttributeValues': {
+            ':seq': record['dynamodb']['SequenceNumber'].zfill(SEQUENCE_WIDTH),
+            ':expires_at': int(time.time()) + APPLIED_TTL_SECONDS,
+        },
+    })
+
+    for attempt in range(stats.TRANSACT_MAX_RETRIES + 1):
+        try:
+            transact_write([marker] + updates)
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'TransactionCanceledException':
+                raise
+            reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+            if reasons and reasons[0] == 'ConditionalCheckFailed':
+                return False
+            if 'TransactionConflict' not in reasons or attempt == stats.TRANSACT_MAX_RETRIES:
+                raise
+            # Full jitter, como los reintentos de BatchGetItem/BatchWriteItem
+            deadline.sleep(random.uniform(0, stats.TRANSACT_BASE_DELAY * 2 ** attempt))
+
+
+def feed_change(old_car, new_car, car_id):
+    """Entrada del feed de cambios para la búsqueda por nombre, o None si el nombre no cambió."""
+    if new_car is None:
+        return {'id': car_id, 'deleted': True}
+    if old_car is None or old_car.get('nombre') != new_car.get('nombre'):
+        return {'id': car_id, 'nombre': new_car.get('nombre')}
+    return None
+
+
+def has_potencia(car):
+    # TipoPotenciaIndex es disperso: solo tiene los carros con potencia numérica
+    potencia = car.get('potencia') if car is not None else None
+    return isinstance(potencia, (int, Decimal)) and not isinstance(potencia, bool)
+
+
+def top_potencia(tipo, latest):
+    """Los stats.TOP_N carros de más potencia del tipo.
+
+    El índice es eventualmente consistente y puede no reflejar aún los registros del
+    lote: los carros del lote se toman de su última imagen (``latest``, id -> carro o
+    None si se borró) y se piden al índice tantos carros más como carros del lote hay.
+    """
+    response = table.query(
+        IndexName=TOP_POTENCIA_INDEX_NAME,
+        KeyConditionExpression='#tipo = :tipo',
+        ExpressionAttributeNames={'#tipo': 'tipo', **{'#' + field: field for field in stats.TOP_FIELDS}},
+        ExpressionAttributeValues={':tipo': tipo},
+        ProjectionExpression=', '.join('#' + field for field in stats.TOP_FIELDS),
+        ScanIndexForward=False,
+        Limit=stats.TOP_N + len(latest)
+    )
+    cars = [car for car in response['Items'] if car['id'] not in latest]
+    cars.extend(car for car in latest.values() if has_potencia(car) and car.get('tipo') == tipo)
+    cars.sort(key=lambda car: (-car['potencia'], car['id']))
+    return cars[:stats.TOP_N]
+
+
+def update_views(changes, latest, tipos):
+    """Vistas que se recalculan una vez por lote: el feed y top_potencia de los tipos afectados."""
+    if changes:
+        position = version.append_changes(changes)
+        logger.debug("Appended %s changes at feed position %s", len(changes), position)
+    for tipo in tipos:
+        stats.set_top_potencia(tipo, top_potencia(tipo, latest))
+    stats.register_tipos(tipos)
+
+
+def process(records):
+    """Aplica los registros en orden; devuelve cuántos se aplicaron antes del primer fallo."""
+    changes = []
+    latest = {}  # id -> última imagen del carro en el lote (None si se borró)
+    tipos = set()  # tipos de todas las imágenes del lote
+    processed = 0
+    try:
+        for record in records:
+            # Se deja tiempo para las vistas del lote; el resto se reintenta en otra invocación
+            if deadline.remaining_seconds() < VIEWS_RESERVE_SECONDS:
+                logger.warning("Stopping after %s of %s records to update the views in time", processed, len(records))
+                break
+            old_car, new_car = images(record)
+            car_id = deserialize_item(record['dynamodb']['Keys'])['id']
+            if not apply_counters(record, old_car, new_car):
+                logger.info("Record %s for car %s already applied", record['dynamodb']['SequenceNumber'], car_id)
+            change = feed_change(old_car, new_car, car_id)
+            if change is not None:
+                changes.append(change)
+            latest[car_id] = new_car
+            tipos.update(car.get('tipo') for car in (old_car, new_car) if car is not None)
+            processed += 1
+    except deadline.DeadlineExceeded:
+        logger.warning("Deadline reached after %s of %s records", processed, len(records))
+    except Exception as e:
+        logger.error("Could not apply record %s: %s", records[processed]['dynamodb']['SequenceNumber'], e)
+
+    if processed:
+        try:
+            update_views(changes, latest, {tipo for tipo in tipos if isinstance(tipo, str) and tipo})
+        except (Exception, deadline.DeadlineExceeded) as e:
+            # Se vuelve a entregar el lote entero; los contadores ya aplicados se saltan
+            logger.error("Could not update derived views: %s", e)
+            return 0
+    return processed
+
+
+@log.sampled
+def lambda_handler(event, context):
+    records = event.get('Records', [])
+    logger.debug("Received %s stream records", len(records))
+    # Sin API Gateway delante: el plazo es el Timeout de la función, no 29 s
+    deadline.start(context, cap_ms=None)
+    try:
+        processed = process(records)
+    finally:
+        deadline.clear()
+
+    logger.info("Applied %s of %s stream records", processed, len(records))
+    # Respuesta de ReportBatchItemFailures: Lambda reintenta desde el primer registro fallido
+    failures = [{'itemIdentifier': record['dynamodb']['SequenceNumber']} for record in records[processed:processed + 1]]
+    return {'batchItemFailures': failures}
@@ -0,0 +1,146 @@
+import os
+import json
+import random
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+
+from cars_common import deadline, http, log, responses, version
+from create_car import table, build_car
+
+# Logger JSON; el nivel sale de LOG_LEVEL
+logger = log.get_logger()
+
+BATCH_WRITE_SIZE = 25  # máximo de elementos por llamada a BatchWriteItem
+MAX_BATCH_ITEMS = int(os.environ.get('MAX_BATCH_ITEMS', '1000'))
+BATCH_WRITE_WORKERS = int(os.environ.get('BATCH_WRITE_WORKERS', '4'))
+BATCH_MAX_RETRIES = int(os.environ.get('BATCH_MAX_RETRIES', '6'))
+BATCH_BASE_DELAY = 0.05
+DEADLINE_ERROR = 'Deadline exceeded before the car was written'
+
+
+def parse_items(event):
+    """Devuelve una lista de (objeto, error) a partir de un arreglo JSON o de NDJSON."""
+    body = http.request_body(event, default='')
+    headers = {k.lower(): v for k, v in (event.get('headers') or {}).items()}
+    content_type = headers.get('content-type', '')
+
+    if 'ndjson' in content_type or 'jsonl' in content_type:
+        # NDJSON: una línea inválida solo invalida ese elemento
+        parsed = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                parsed.append((json.loads(line), None))
+            except json.JSONDecodeError as e:
+                parsed.append((None, f'Invalid JSON line: {e}'))
+        return parsed
+
+    items = json.loads(body)
+    if not isinstance(items, list):
+        raise ValueError('Request body must be a JSON array of cars')
+    return [(item, None) for item in items]
+
+
+def write_chunk(cars):
+    """Escribe hasta 25 carros y devuelve {id: error} de los que no se pudieron escribir.
+
+    Si un reintento falla o se agota el plazo, solo fallan los carros que seguían sin
+    procesar: los que escribió un intento anterior ya están en la tabla.
+    """
+    unprocessed = cars
+    try:
+        for attempt in range(BATCH_MAX_RETRIES + 1):
+            unprocessed = table.batch_put(unprocessed)
+            if not unprocessed:
+                return {}
+            if attempt < BATCH_MAX_RETRIES:
+                # Full jitter: evita que todos los hilos reintenten a la vez
+                deadline.sleep(random.uniform(0, BATCH_BASE_DELAY * 2 ** attempt))
+    except ClientError as e:
+        logger.error("BatchWriteItem failed: %s", e)
+        return {car['id']: str(e) for car in unprocessed}
+    except deadline.DeadlineExceeded:
+        logger.warning("Deadline exceeded with %s of %s cars unprocessed", len(unprocessed), len(cars))
+        return {car['id']: DEADLINE_ERROR for car in unprocessed}
+
+    return {car['id']: f'Unprocessed after {BATCH_MAX_RETRIES} retries' for car in unprocessed}
+
+
+def batch_write_cars(cars):
+    """Escribe los carros en bloques de 25 con varios hilos en paralelo."""
+    chunks = [cars[i:i + BATCH_WRITE_SIZE] for i in range(0, len(cars), BATCH_WRITE_SIZE)]
+    failures = {}
+    if not chunks:
+        return failures
+    with ThreadPoolExecutor(max_workers=min(BATCH_WRITE_WORKERS, len(chunks))) as executor:
+        for chunk_failures in executor.map(write_chunk, chunks):
+            failures.update(chunk_failures)
+    return failures
+
+
+@deadline.bounded
+@log.sampled
+def lambda_handler(event, context):
+    try:
+        try:
+            parsed = parse_items(event)
+        except (ValueError, json.JSONDecodeError) as e:
+            logger.warning("Invalid batch body: %s", e)
+            return responses.error(400, 'Invalid request body', str(e))
+
+        if len(parsed) > MAX_BATCH_ITEMS:
+            return responses.error(400, 'Too many items', f'At most {MAX_BATCH_ITEMS} cars per request')
+
+        # Valida cada elemento con las mismas reglas que POST /car
+        results = []
+        cars = []
+        for index, (item, error) in enumerate(parsed):
+            if error is None and not isinstance(item, dict):
+                error = 'Each car must be a JSON object'
+            if error is not None:
+                results.append({'index': index, 'status': 'error', 'error': 'Invalid item', 'details': error})
+                continue
+            try:
+                car = build_car(item)
+            except KeyError as e:
+                results.append({'index': index, 'status': 'error', 'error': 'Missing required fields', 'details': str(e)})
+                continue
+            except ValueError as e:
+                results.append({'index': index, 'status': 'error', 'error': 'Invalid field value', 'details': str(e)})
+                continue
+            cars.append(car)
+            results.append({'index': index, 'status': 'created', 'id': car['id']})
+
+        # Cada bloque informa sus carros sin escribir también si se agota el plazo, así que
+        # los ya escritos se devuelven como creados y la versión se incrementa igual
+        failures = batch_write_cars(cars)
+        timed_out = DEADLINE_ERROR in failures.values()
+        for result in results:
+            car_id = result.get('id')
+            if car_id in failures:
+                del result['id']
+                result.update(status='error', error='Error en la operación de DynamoDB', details=failures[car_id])
+
+        created = sum(1 for result in results if result['status'] == 'created')
+        logger.info("Batch create: %s of %s cars created", created, len(results))
+        if created:
+            if timed_out:
+                # Sin esta UpdateItem las cachés de GET /car no verían los carros ya escritos;
+                # cabe en el margen que deadline deja antes del corte de API Gateway
+                deadline.clear()
+            version.bump()
+
+        if created == len(results):
+            status_code = 200
+        elif created:
+            status_code = 207
+        else:
+            status_code = (503 if timed_out else 500) if failures else 400
+        return responses.json_response(
+            status_code, {'created': created, 'failed': len(results) - created, 'results': results}
+        )
+
+    except Exception as e:
+        logger.error("Exception occurred: %s", e)
+        return responses.internal_error(e)
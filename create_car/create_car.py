@@ -1,94 +1,71 @@
 import json
-import boto3
 import uuid
-import logging
 from botocore.exceptions import ClientError
 
-# Configuración del logging
-logging.basicConfig(level=logging.DEBUG)
-logger = logging.getLogger()
-
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table('CarsTable')
-common_headers = {
-    'Access-Control-Allow-Headers': '*',
-    'Access-Control-Allow-Origin': '*',
-    'Access-Control-Allow-Methods': 'OPTIONS,POST,GET,PUT,DELETE'
-}
+from cars_common import deadline, http, log, responses, schema, version
+from cars_common.db import table
+
+# Logger JSON; el nivel sale de LOG_LEVEL
+logger = log.get_logger()
+
+REQUIRED_FIELDS = list(schema.CAR_FIELDS)
+
+
+def build_car(body):
+    """Verifica los campos requeridos y arma el registro del carro con un id nuevo.
+
+    ``potencia`` y ``capacidad`` se guardan como números y ``tipo`` como texto no vacío
+    (ValueError si no lo son).
+    """
+    logger.debug("Checking required fields: %s", REQUIRED_FIELDS)
+
+    for field in REQUIRED_FIELDS:
+        if field not in body:
+            logger.error("Missing required field: %s", field)
+            raise KeyError(field)
+
+    car = {'id': str(uuid.uuid4())}
+    car.update(schema.normalize_car(body))
+    return car
+
+
+@deadline.bounded
+@log.sampled
 def lambda_handler(event, context):
     logger.debug("Lambda handler started.")
     logger.debug("Event received: %s", event)
 
     try:
         # Verifica que el cuerpo de la solicitud esté presente
-        body = json.loads(event.get('body', '{}'))  # Deserializa el cuerpo del evento
+        body = json.loads(http.request_body(event))  # Deserializa el cuerpo del evento
         logger.debug("Parsed body: %s", body)
 
         # Verifica que los campos requeridos estén presentes en el cuerpo
-        required_fields = ['nombre', 'tipo', 'potencia', 'capacidad']
-        logger.debug("Checking required fields: %s", required_fields)
-
-        for field in required_fields:
-            if field not in body:
-                logger.error("Missing required field: %s", field)
-                raise KeyError(field)
-
-        car_id = str(uuid.uuid4())
-        car = {
-            'id': car_id,
-            'nombre': body['nombre'],
-            'tipo': body['tipo'],
-            'potencia': body['potencia'],
-            'capacidad': body['capacidad']
-        }
+        car = build_car(body)
         logger.debug("Creating car record: %s", car)
 
         table.put_item(Item=car)
+        version.bump()
         logger.info("Car record successfully inserted into DynamoDB.")
 
-        response_body = {
-            'message': 'Registro exitoso',
-            'car': car
-        }
-
-        return {
-            'statusCode': 200,
-            'body': json.dumps(response_body),
-            'headers': common_headers
-        }
+        return responses.json_response(200, {'message': 'Registro exitoso', 'car': car})
 
     except KeyError as e:
-        logger.error("KeyError occurred: %s", str(e))
-        response_body = {
-            'error': 'Missing required fields',
-            'details': str(e)
-        }
-        return {
-            'statusCode': 400,
-            'body': json.dumps(response_body),
-            'headers': common_headers
-        }
+        logger.error("KeyError occurred: %s", e)
+        return responses.error(400, 'Missing required fields', str(e))
+
+    except json.JSONDecodeError as e:
+        logger.error("JSON Decode Error: %s", e)
+        return responses.error(400, 'Invalid JSON format', str(e))
+
+    except ValueError as e:
+        logger.error("Invalid field value: %s", e)
+        return responses.error(400, 'Invalid field value', str(e))
 
     except ClientError as e:
-        logger.error("ClientError occurred: %s", str(e))
-        response_body = {
-            'error': 'Error en la operación de DynamoDB',
-            'details': str(e)
-        }
-        return {
-            'statusCode': 500,
-            'body': json.dumps(response_body),
-            'headers': common_headers
-        }
+        logger.error("ClientError occurred: %s", e)
+        return responses.client_error(e)
 
     except Exception as e:
-        logger.error("Exception occurred: %s", str(e))
-        response_body = {
-            'error': 'Error interno del servidor',
-            'details': str(e)
-        }
-        return {
-            'statusCode': 500,
-            'body': json.dumps(response_body),
-            'headers': common_headers
-        }
\ No newline at end of file
+        logger.error("Exception occurred: %s", e)
+        return responses.internal_error(e)
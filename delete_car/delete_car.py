@@ -1,75 +1,43 @@
-import json
-import boto3
-import logging
 from botocore.exceptions import ClientError
 
-# Configura el logger
-logger = logging.getLogger()
-logger.setLevel(logging.DEBUG)
+from cars_common import deadline, log, responses, version
+from cars_common.db import table
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table('CarsTable')
-common_headers = {
-    'Access-Control-Allow-Headers': '*',
-    'Access-Control-Allow-Origin': '*',
-    'Access-Control-Allow-Methods': 'OPTIONS,POST,GET,PUT,DELETE'
-}
+# Logger JSON; el nivel sale de LOG_LEVEL
+logger = log.get_logger()
+
+
+@deadline.bounded
+@log.sampled
 def lambda_handler(event, context):
     try:
         # Registra el evento recibido
-        logger.debug(f"Received event: {json.dumps(event)}")
+        logger.debug("Received event: %s", event)
 
         # Obtén el ID del parámetro de la ruta
-        car_id = event['pathParameters']['id']
-        logger.debug(f"Car ID: {car_id}")
+        car_id = (event.get('pathParameters') or {}).get('id')
+        logger.debug("Car ID: %s", car_id)
 
         if not car_id:
             logger.warning("Missing path parameter: id")
-            return {
-                'statusCode': 400,
-                'body': json.dumps({'error': 'Missing path parameter: id'}),
-                'headers': common_headers
-            }
+            return responses.raw(400, responses.MISSING_ID)
 
         # Intenta eliminar el elemento
         response = table.delete_item(
             Key={'id': car_id},
             ConditionExpression="attribute_exists(id)"
         )
-        logger.info(f"Delete response: {response}")
+        version.bump()
+        logger.debug("Delete response: %s", response)
 
-        return {
-            'statusCode': 200,
-            'body': json.dumps({'message': 'Carro eliminado exitosamente'}),
-            'headers': common_headers
-        }
+        return responses.raw(200, responses.CAR_DELETED)
 
     except ClientError as e:
-        logger.error(f"DynamoDB ClientError: {e}")
+        logger.error("DynamoDB ClientError: %s", e)
         if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
-            return {
-                'statusCode': 404,
-                'body': json.dumps({'error': 'Car not found'}),
-                'headers': common_headers
-            }
-        return {
-            'statusCode': 500,
-            'body': json.dumps({'error': 'DynamoDB error', 'details': str(e)}),
-            'headers': common_headers
-        }
-
-    except KeyError as e:
-        logger.error(f"KeyError: {e}")
-        return {
-            'statusCode': 400,
-            'body': json.dumps({'error': 'Missing path parameter', 'details': str(e)}),
-            'headers': common_headers
-        }
+            return responses.raw(404, responses.CAR_NOT_FOUND)
+        return responses.client_error(e)
 
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
-        return {
-            'statusCode': 500,
-            'body': json.dumps({'error': 'Internal server error', 'details': str(e)}),
-            'headers': common_headers
-        }
\ No newline at end of file
+        logger.error("Unexpected error: %s", e)
+        return responses.internal_error(e)
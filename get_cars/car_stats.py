@@ -0,0 +1,77 @@
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+
+from cars_common import deadline, log, responses, schema, stats
+from cars_common.db import table
+
+# Logger JSON; el nivel sale de LOG_LEVEL
+logger = log.get_logger()
+
+STATS_WORKERS = 8
+
+
+def extreme(tipo, attribute, descending):
+    """Mínimo (o máximo) del atributo en el tipo: el primer elemento de su índice por rango."""
+    response = table.query(
+        IndexName=schema.RANGE_INDEX_NAMES[attribute],
+        KeyConditionExpression='#tipo = :tipo',
+        ExpressionAttributeNames={'#tipo': 'tipo', '#r': attribute},
+        ExpressionAttributeValues={':tipo': tipo},
+        ProjectionExpression='#r',
+        ScanIndexForward=not descending,
+        Limit=1
+    )
+    items = response['Items']
+    return items[0][attribute] if items else None
+
+
+def tipo_stats(tipo, counters):
+    """Cuenta, suma, promedio, mínimo y máximo de potencia y capacidad de un tipo."""
+    count = counters['count']
+    result = {'tipo': tipo, 'count': count, 'top_potencia': counters['top_potencia']}
+    for attribute in schema.RANGE_INDEX_NAMES:
+        total = counters['sum_' + attribute]
+        result[attribute] = {
+            'sum': total,
+            'avg': round(total / count, 2) if count else None,
+            'min': extreme(tipo, attribute, descending=False) if count else None,
+            'max': extreme(tipo, attribute, descending=True) if count else None,
+        }
+    return result
+
+
+@deadline.bounded
+@log.sampled
+def lambda_handler(event, context):
+    try:
+        logger.debug("Received event: %s", event)
+
+        params = event.get('queryStringParameters') or {}
+        try:
+            tipos = [schema.parse_tipo(params['tipo'])] if 'tipo' in params else None
+        except ValueError as e:
+            logger.warning("Invalid query parameter: %s", e)
+            return responses.error(400, 'Invalid query parameter', str(e))
+
+        if tipos is None:
+            tipos = stats.registered_tipos()
+        counters = stats.read(tipos)
+        # Los tipos que quedaron sin carros se omiten
+        tipos = [tipo for tipo in tipos if counters.get(tipo, {}).get('count')]
+
+        # Cuatro Query de un elemento por tipo (mín./máx. de potencia y capacidad)
+        with ThreadPoolExecutor(max_workers=max(1, min(STATS_WORKERS, len(tipos)))) as executor:
+            items = list(executor.map(lambda tipo: tipo_stats(tipo, counters[tipo]), tipos))
+        logger.info("Stats for %s tipos", len(items))
+        return responses.json_response(200, {
+            'items': items,
+            'total': sum(item['count'] for item in items)
+        })
+
+    except ClientError as e:
+        logger.error("DynamoDB ClientError: %s", e)
+        return responses.client_error(e)
+
+    except Exception as e:
+        logger.error("Unexpected error: %s", e)
+        return responses.internal_error(e)
@@ -0,0 +1,52 @@
+from botocore.exceptions import ClientError
+
+from cars_common import deadline, encoding, http, log, responses, schema
+from cars_common.db import table
+
+# Logger JSON; el nivel sale de LOG_LEVEL
+logger = log.get_logger()
+
+
+@deadline.bounded
+@log.sampled
+def lambda_handler(event, context):
+    try:
+        logger.debug("Received event: %s", event)
+
+        # Obtén el ID del parámetro de la ruta
+        car_id = (event.get('pathParameters') or {}).get('id')
+        logger.debug("Car ID: %s", car_id)
+
+        if not car_id:
+            logger.warning("Missing path parameter: id")
+            return responses.raw(400, responses.MISSING_ID)
+
+        params = event.get('queryStringParameters') or {}
+        try:
+            projection = schema.projection(schema.parse_fields(params['fields']) if 'fields' in params else None)
+        except ValueError as e:
+            logger.warning("Invalid query parameter: %s", e)
+            return responses.error(400, 'Invalid query parameter', str(e))
+
+        # Lectura puntual por clave: 0.5 RCU (1 RCU si se pide lectura consistente)
+        response = table.get_item(
+            Key={'id': car_id},
+            ConsistentRead=params.get('consistent') == 'true',
+            **projection
+        )
+
+        car = response.get('Item')
+        if car is None:
+            logger.info("Car %s not found", car_id)
+            return responses.raw(404, responses.CAR_NOT_FOUND)
+
+        # Claves ordenadas: el mismo carro produce siempre el mismo cuerpo y el mismo ETag
+        return http.conditional_response(event, encoding.dumps(car, sort_keys=True))
+
+    except ClientError as e:
+        logger.error("DynamoDB ClientError: %s", e)
+        return responses.client_error(e)
+
+    except Exception as e:
+        logger.error("Unexpected error: %s", e)
+        return responses.internal_error(e)
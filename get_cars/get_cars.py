@@ -1,73 +1,428 @@
 import json
-import boto3
-import logging
+import os
+import hmac
+import base64
+import hashlib
+import math
+import time
 from botocore.exceptions import ClientError
-from decimal import Decimal
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
 
-# Configura el logger
-logger = logging.getLogger()
-logger.setLevel(logging.DEBUG)
+from cars_common import deadline, encoding, http, log, responses, schema, version
+from cars_common.db import table, iter_scan_pages, serialize_item, deserialize_item, BATCH_GET_SIZE
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table('CarsTable')
+# Logger JSON; el nivel sale de LOG_LEVEL
+logger = log.get_logger()
 
-common_headers = {
-    'Access-Control-Allow-Headers': '*',
-    'Access-Control-Allow-Origin': '*',
-    'Access-Control-Allow-Methods': 'OPTIONS,POST,GET,PUT,DELETE'
+# Paginación: tamaño de página por defecto/máximo y clave para firmar los cursores
+DEFAULT_PAGE_SIZE = int(os.environ.get('PAGE_SIZE', '50'))
+MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', '1000'))
+# Sin CURSOR_SECRET no hay clave con la que firmar: la paginación falla en lugar de
+# usar una clave conocida con la que cualquiera podría falsificar cursores
+CURSOR_SECRET = os.environ.get('CURSOR_SECRET', '')
+
+# Lectura completa: escaneo paralelo por segmentos (Segment/TotalSegments)
+MAX_SCAN_SEGMENTS = int(os.environ.get('MAX_SCAN_SEGMENTS', '10'))
+SCAN_PAGE_BYTES = 1024 * 1024  # DynamoDB devuelve como máximo 1 MB por página de scan
+PAGES_PER_SEGMENT = int(os.environ.get('PAGES_PER_SEGMENT', '4'))
+SCAN_PAGE_MS = int(os.environ.get('SCAN_PAGE_MS', '100'))
+SAFETY_MARGIN_MS = int(os.environ.get('SAFETY_MARGIN_MS', '1000'))
+TABLE_SIZE_TTL_SECONDS = 3600  # DynamoDB solo actualiza TableSizeBytes cada ~6 horas
+
+_table_size_cache = {'bytes': None, 'expires_at': 0.0}
+
+# Lectura por lotes (?ids=a,b,c) con BatchGetItem
+MAX_BATCH_IDS = int(os.environ.get('MAX_BATCH_IDS', '500'))
+BATCH_GET_WORKERS = int(os.environ.get('BATCH_GET_WORKERS', '5'))
+
+# Listado por categoría (?tipo=SUV) con Query sobre el GSI de tipo: las RCU consumidas
+# dependen de los carros de ese tipo y no del tamaño de la tabla
+TIPO_INDEX_NAME = os.environ.get('TIPO_INDEX_NAME', 'TipoIndex')
+# Rangos y orden numéricos dentro de un tipo (?minPotencia=&maxPotencia=&sort=potencia)
+# con los índices de schema.RANGE_INDEX_NAMES
+RANGE_PARAMS = {
+    'potencia': ('minPotencia', 'maxPotencia'),
+    'capacidad': ('minCapacidad', 'maxCapacidad'),
 }
 
-def decimal_to_float(obj):
-    if isinstance(obj, Decimal):
-        return float(obj)
-    if isinstance(obj, dict):
-        return {k: decimal_to_float(v) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [decimal_to_float(i) for i in obj]
-    return obj
+# Caché de respuestas de listado en el contenedor. Cada entrada guarda la versión de
+# los datos (cars_common.version) con la que se generó; se sirve solo si la versión
+# actual coincide y no venció el TTL, que acota lo desactualizado si falla un bump.
+# La versión se lee con una GetItem consistente y los scans que llenan la caché también
+# son consistentes; las Query de los GSI no pueden serlo (una escritura puede tardar en
+# llegar al índice), así que sus entradas duran solo RESPONSE_CACHE_INDEX_TTL_SECONDS.
+RESPONSE_CACHE_TTL_SECONDS = float(os.environ.get('RESPONSE_CACHE_TTL_SECONDS', '60'))
+RESPONSE_CACHE_INDEX_TTL_SECONDS = float(os.environ.get('RESPONSE_CACHE_INDEX_TTL_SECONDS', '2'))
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+
+_response_cache = OrderedDict()  # clave -> (versión, expira, statusCode, body, ETag, {codificación: body})
+_response_cache_size = 0
+
+
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def _sign(payload):
+    if not CURSOR_SECRET:
+        raise RuntimeError('CURSOR_SECRET is not configured')
+    return hmac.new(CURSOR_SECRET.encode('utf-8'), payload, hashlib.sha256).digest()[:16]
+
+
+def encode_cursor(last_evaluated_key):
+    """Convierte un LastEvaluatedKey en un token opaco y firmado.
+
+    La clave va con los tipos de DynamoDB ({'N': '...'}): una clave numérica de un
+    índice por rango vuelve tal cual y no redondeada por un float de JSON.
+    """
+    payload = json.dumps(serialize_item(last_evaluated_key), separators=(',', ':'), sort_keys=True).encode('utf-8')
+    return _b64encode(payload) + '.' + _b64encode(_sign(payload))
+
+
+def decode_cursor(cursor):
+    """Valida la firma de un cursor y devuelve el ExclusiveStartKey que contiene."""
+    try:
+        encoded_payload, encoded_signature = cursor.split('.')
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+    except (ValueError, TypeError):
+        raise ValueError('Malformed cursor')
+
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise ValueError('Invalid cursor signature')
+
+    try:
+        start_key = deserialize_item(json.loads(payload))
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError('Malformed cursor')
+    if not isinstance(start_key.get('id'), str):
+        raise ValueError('Malformed cursor')
+    return start_key
+
+
+def parse_limit(value):
+    if value is None:
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f'limit must be between 1 and {MAX_PAGE_SIZE}')
+    return limit
+
+
+def request_path(event):
+    # requestContext.path incluye el stage (/Prod/car), event['path'] no
+    return (event.get('requestContext') or {}).get('path') or event.get('path') or '/car'
+
+
+def next_link(event, params, limit, last_evaluated_key):
+    path = request_path(event)
+    query = dict(params)
+    query['limit'] = limit
+    query['cursor'] = encode_cursor(last_evaluated_key)
+    return path + '?' + urlencode(query)
+
+
+def table_size_bytes():
+    """Tamaño aproximado de la tabla según DescribeTable, cacheado en el contenedor."""
+    now = time.monotonic()
+    if _table_size_cache['bytes'] is None or now >= _table_size_cache['expires_at']:
+        _table_size_cache['bytes'] = table.describe()['TableSizeBytes']
+        _table_size_cache['expires_at'] = now + TABLE_SIZE_TTL_SECONDS
+    return _table_size_cache['bytes']
+
+
+def scan_segments_for(size_bytes, remaining_ms):
+    """Elige TotalSegments según el tamaño de la tabla y el tiempo que le queda a la invocación."""
+    pages = max(1, math.ceil(size_bytes / SCAN_PAGE_BYTES))
+    by_size = math.ceil(pages / PAGES_PER_SEGMENT)
+    # Cada segmento lee sus páginas en serie: hacen falta suficientes para terminar a tiempo
+    budget_ms = max(remaining_ms - SAFETY_MARGIN_MS, SCAN_PAGE_MS)
+    by_time = math.ceil(pages * SCAN_PAGE_MS / budget_ms)
+    return max(1, min(MAX_SCAN_SEGMENTS, max(by_size, by_time)))
+
+
+def parallel_scan(total_segments, projection=None, consistent=False):
+    """Escanea la tabla completa con un hilo por segmento y une los resultados."""
+    scan_kwargs = dict(projection or {}, ConsistentRead=True) if consistent else projection
+    return [item for page in iter_scan_pages(table, total_segments, scan_kwargs=scan_kwargs) for item in page]
+
+
+def parse_ids(value):
+    # BatchGetItem rechaza claves duplicadas: se eliminan conservando el orden pedido
+    ids = list(dict.fromkeys(car_id.strip() for car_id in value.split(',') if car_id.strip()))
+    if not ids:
+        raise ValueError('ids must contain at least one id')
+    if len(ids) > MAX_BATCH_IDS:
+        raise ValueError(f'ids accepts at most {MAX_BATCH_IDS} ids')
+    return ids
 
 
+def parse_tipo_query(params, tipo):
+    """Lee los filtros de rango y el orden; devuelve (atributo, mínimo, máximo, descendente).
+
+    Solo un atributo numérico por petición: es la clave de ordenación del índice
+    que se consulta, así que el rango se resuelve con la condición de clave.
+    """
+    attributes = {
+        attribute for attribute, names in RANGE_PARAMS.items() if any(name in params for name in names)
+    }
+    sort = params.get('sort')
+    descending = bool(sort) and sort.startswith('-')
+    if sort:
+        sort_attribute = sort[1:] if descending else sort
+        if sort_attribute not in schema.RANGE_INDEX_NAMES:
+            raise ValueError(f'sort accepts only {", ".join(schema.RANGE_INDEX_NAMES)} (prefix - for descending)')
+        attributes.add(sort_attribute)
+    if not attributes:
+        return None, None, None, False
+    if len(attributes) > 1:
+        raise ValueError('range filters and sort must use a single attribute')
+    if tipo is None:
+        raise ValueError('range filters and sort require tipo')
+
+    attribute, = attributes
+    min_name, max_name = RANGE_PARAMS[attribute]
+    low = schema.to_number(params[min_name]) if min_name in params else None
+    high = schema.to_number(params[max_name]) if max_name in params else None
+    if low is not None and high is not None and low > high:
+        raise ValueError(f'{min_name} must not be greater than {max_name}')
+    return attribute, low, high, descending
+
+
+def cursor_keys(tipo, attribute):
+    """Atributos del LastEvaluatedKey de la lectura que corresponde a estos parámetros."""
+    if tipo is None:
+        return {'id'}
+    if attribute is None:
+        return {'id', 'tipo'}
+    return {'id', 'tipo', attribute}
+
+
+def query_by_tipo(tipo, projection, attribute=None, low=None, high=None, descending=False, **kwargs):
+    """Una página de carros del tipo pedido, del GSI de tipo o del de rango si hay atributo."""
+    names = dict(projection.get('ExpressionAttributeNames', {}), **{'#tipo': 'tipo'})
+    values = {':tipo': tipo}
+    key_condition = '#tipo = :tipo'
+    # Sin límites (solo sort) el índice de rango ya devuelve el tipo completo ordenado
+    if low is not None and high is not None:
+        key_condition += ' AND #r BETWEEN :low AND :high'
+        values.update({':low': low, ':high': high})
+    elif low is not None:
+        key_condition += ' AND #r >= :low'
+        values[':low'] = low
+    elif high is not None:
+        key_condition += ' AND #r <= :high'
+        values[':high'] = high
+    if low is not None or high is not None:
+        names['#r'] = attribute
+    return table.query(
+        IndexName=schema.RANGE_INDEX_NAMES[attribute] if attribute else TIPO_INDEX_NAME,
+        KeyConditionExpression=key_condition,
+        ExpressionAttributeValues=values,
+        ScanIndexForward=not descending,
+        **dict(projection, ExpressionAttributeNames=names, **kwargs)
+    )
+
+
+def query_all_by_tipo(tipo, projection, **query_kwargs):
+    """Todas las páginas de un tipo; a diferencia del scan completo, sin segmentos paralelos."""
+    cars = []
+    kwargs = dict(query_kwargs)
+    while True:
+        response = query_by_tipo(tipo, projection, **kwargs)
+        cars.extend(response['Items'])
+        if 'LastEvaluatedKey' not in response:
+            return cars
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def _batch_get_chunk(ids, projection=None):
+    """Lee un bloque de hasta BATCH_GET_SIZE ids; las claves sin procesar las reintenta la tabla."""
+    return table.batch_get_all([{'id': car_id} for car_id in ids], **(projection or {}))
+
+
+def batch_get_cars(ids, projection=None):
+    """Lee los carros pedidos en bloques concurrentes y los devuelve en el orden solicitado."""
+    chunks = [ids[i:i + BATCH_GET_SIZE] for i in range(0, len(ids), BATCH_GET_SIZE)]
+    if len(chunks) == 1:
+        results = [_batch_get_chunk(chunks[0], projection)]
+    else:
+        with ThreadPoolExecutor(max_workers=min(BATCH_GET_WORKERS, len(chunks))) as executor:
+            results = list(executor.map(lambda chunk: _batch_get_chunk(chunk, projection), chunks))
+
+    by_id = {item['id']: item for chunk_items in results for item in chunk_items}
+    cars = [by_id[car_id] for car_id in ids if car_id in by_id]
+    missing = [car_id for car_id in ids if car_id not in by_id]
+    return cars, missing
+
+
+def _evict(key):
+    global _response_cache_size
+    entry = _response_cache.pop(key, None)
+    if entry is not None:
+        _response_cache_size -= len(entry[3])
+
+
+def cached_response(key, data_version):
+    """Devuelve (statusCode, body, ETag, cuerpos comprimidos) si siguen vigentes para esta versión."""
+    entry = _response_cache.get(key)
+    if entry is None:
+        return None
+    entry_version, expires_at, status_code, body, etag, encoded_bodies = entry
+    if entry_version != data_version or time.monotonic() >= expires_at:
+        _evict(key)
+        return None
+    _response_cache.move_to_end(key)
+    return status_code, body, etag, encoded_bodies
+
+
+def cache_response(key, data_version, status_code, body, etag=None, encoded_bodies=None, ttl=None):
+    global _response_cache_size
+    ttl = RESPONSE_CACHE_TTL_SECONDS if ttl is None else ttl
+    if ttl <= 0 or len(body) > RESPONSE_CACHE_MAX_BYTES:
+        return
+    _evict(key)
+    _response_cache[key] = (
+        data_version, time.monotonic() + ttl, status_code, body, etag, encoded_bodies
+    )
+    _response_cache_size += len(body)
+    # Descarta las entradas menos usadas hasta volver al límite (len() en caracteres ≈ bytes)
+    while _response_cache_size > RESPONSE_CACHE_MAX_BYTES:
+        _evict(next(iter(_response_cache)))
+
+
+def read_data_version():
+    """Versión actual de los datos, o None si no se pudo leer (se omite la caché)."""
+    try:
+        return version.current()
+    except ClientError as e:
+        logger.warning("Could not read cars version, skipping response cache: %s", e)
+        return None
+
+
+def read_all_cars(context, projection=None, consistent=False):
+    try:
+        size_bytes = table_size_bytes()
+    except ClientError as e:
+        logger.warning("DescribeTable failed, using %s scan segments: %s", MAX_SCAN_SEGMENTS, e)
+        size_bytes = MAX_SCAN_SEGMENTS * PAGES_PER_SEGMENT * SCAN_PAGE_BYTES
+    # Plazo de la invocación (ya limitado a los 29 s de API Gateway)
+    remaining_ms = deadline.remaining_seconds() * 1000
+    total_segments = scan_segments_for(size_bytes, remaining_ms)
+    logger.info("Full read with %s scan segments (table size %s bytes)", total_segments, size_bytes)
+    return parallel_scan(total_segments, projection, consistent)
+
+
+@deadline.bounded
+@log.sampled
 def lambda_handler(event, context):
     try:
-        logger.debug("Received event: %s", json.dumps(event))
+        logger.debug("Received event: %s", event)
 
-        # Realiza la operación de escaneo en la tabla DynamoDB
-        response = table.scan()
-        logger.debug("DynamoDB scan response: %s", response)
+        params = event.get('queryStringParameters') or {}
+        try:
+            limit = parse_limit(params.get('limit'))
+            start_key = decode_cursor(params['cursor']) if params.get('cursor') else None
+            ids = parse_ids(params['ids']) if 'ids' in params else None
+            # Solo los atributos pedidos: menos bytes leídos de DynamoDB y menos que serializar
+            projection = schema.projection(schema.parse_fields(params['fields']) if 'fields' in params else None)
+            tipo = schema.parse_tipo(params['tipo']) if 'tipo' in params else None
+            if tipo is not None and ids is not None:
+                raise ValueError('tipo cannot be combined with ids')
+            attribute, low, high, descending = parse_tipo_query(params, tipo)
+            # Los cursores de los GSI llevan las claves del índice: no sirven para el scan,
+            # para otro índice ni para otro tipo
+            if start_key and (set(start_key) != cursor_keys(tipo, attribute) or start_key.get('tipo') != tipo):
+                raise ValueError('cursor does not match this query')
+        except ValueError as e:
+            logger.warning("Invalid query parameter: %s", e)
+            return responses.error(400, 'Invalid query parameter', str(e))
 
-        cars = response['Items']
-        logger.debug("Items retrieved from DynamoDB: %s", cars)
+        if ids is not None:
+            # Lectura de carros concretos por id (carrito, comparador)
+            cars, missing = batch_get_cars(ids, projection)
+            logger.info("Batch read of %s ids, %s missing", len(ids), len(missing))
+            # Claves ordenadas, como get_car: el ETag no depende del orden de los atributos
+            body = encoding.dumps({'items': cars, 'missing': missing}, sort_keys=True)
+            return http.compress(event, http.conditional_response(event, body))
 
-        # Convierte los valores Decimal a float
-        cars = decimal_to_float(cars)
-        logger.debug("Items after conversion to float: %s", cars)
+        # La versión se lee antes que los datos: una escritura concurrente deja la
+        # entrada con una versión ya superada y no se vuelve a servir
+        cache_key = (request_path(event), tuple(sorted(params.items())))
+        data_version = read_data_version()
+        cached = cached_response(cache_key, data_version) if data_version is not None else None
+        if cached:
+            logger.debug("Response cache hit for %s", cache_key)
+            status_code, body, etag, encoded_bodies = cached
+            if status_code == 200:
+                return http.compress(event, http.conditional_response(event, body, etag), encoded_bodies)
+            return responses.raw(status_code, body)
 
-        if not cars:
+        if tipo is not None:
+            query_kwargs = {'attribute': attribute, 'low': low, 'high': high, 'descending': descending}
+            if params.get('all') == 'true':
+                response = {'Items': query_all_by_tipo(tipo, projection, **query_kwargs)}
+            else:
+                query_kwargs['Limit'] = limit
+                if start_key:
+                    query_kwargs['ExclusiveStartKey'] = start_key
+                response = query_by_tipo(tipo, projection, **query_kwargs)
+        elif params.get('all') == 'true':
+            # Lectura completa (exportaciones, paneles de administración)
+            response = {'Items': read_all_cars(context, projection, consistent=data_version is not None)}
+        else:
+            # Lee una sola página acotada de la tabla en lugar de escanearla completa. Si
+            # va a la caché, la lectura es consistente: una eventual podría no ver una
+            # escritura anterior a la versión leída y guardarla con esa versión
+            scan_kwargs = dict(projection, Limit=limit)
+            if data_version is not None:
+                scan_kwargs['ConsistentRead'] = True
+            if start_key:
+                scan_kwargs['ExclusiveStartKey'] = start_key
+            response = table.scan(**scan_kwargs)
+        cars = response['Items']
+        # Solo el conteo: el contenido de la página puede ser la tabla completa
+        logger.debug("Read returned %s items", len(cars))
+
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        # Un tipo sin carros es una página vacía, no una tabla vacía
+        if not cars and not last_evaluated_key and not start_key and tipo is None:
             logger.info("No cars found.")
-            return {
-                'statusCode': 204,
-                'body': json.dumps({'message': 'No hay carros registrados aun.'}),
-                'headers': common_headers
-            }
-
-        return {
-            'statusCode': 200,
-            'body': json.dumps(cars),
-            'headers': common_headers
-        }
+            status_code = 204
+            body = responses.NO_CARS
+        else:
+            status_code = 200
+            body = encoding.dumps({
+                'items': cars,
+                'next': next_link(event, params, limit, last_evaluated_key) if last_evaluated_key else None
+            }, sort_keys=True)
+
+        cache_ttl = RESPONSE_CACHE_INDEX_TTL_SECONDS if tipo is not None else None
+        if status_code != 200:
+            if data_version is not None:
+                cache_response(cache_key, data_version, status_code, body, ttl=cache_ttl)
+            return responses.raw(status_code, body)
+
+        # El ETag y los cuerpos comprimidos se calculan una vez y se guardan con la entrada
+        etag = http.etag_for(body)
+        encoded_bodies = {}
+        if data_version is not None:
+            cache_response(cache_key, data_version, status_code, body, etag, encoded_bodies, ttl=cache_ttl)
+        return http.compress(event, http.conditional_response(event, body, etag), encoded_bodies)
 
     except ClientError as e:
         logger.error("DynamoDB ClientError: %s", e)
-        return {
-            'statusCode': 500,
-            'body': json.dumps({'error': 'DynamoDB error', 'details': str(e)}),
-            'headers': common_headers
-        }
+        return responses.client_error(e)
 
     except Exception as e:
         logger.error("Unexpected error: %s", e)
-        return {
-            'statusCode': 500,
-            'body': json.dumps({'error': 'Internal server error', 'details': str(e)}),
-            'headers': common_headers
-        }
\ No newline at end of file
+        return responses.internal_error(e)
\ No newline at end of file
@@ -0,0 +1,237 @@
+import os
+import math
+import time
+import bisect
+import unicodedata
+from botocore.exceptions import ClientError
+from collections import defaultdict
+
+from cars_common import deadline, log, responses, schema, version
+from cars_common.db import table, iter_scan_pages
+
+# Logger JSON; el nivel sale de LOG_LEVEL
+logger = log.get_logger()
+
+# Búsqueda por nombre (GET /car/search?q=) sobre un índice en memoria del contenedor.
+# Se construye con un scan de id/nombre y se mantiene con el feed de cambios que
+# escribe car_views desde el stream de CarsTable; cada cuánto se consulta el feed
+# (más lo que tarde el stream) acota lo desactualizado.
+SEARCH_REFRESH_SECONDS = float(os.environ.get('SEARCH_REFRESH_SECONDS', '5'))
+SEARCH_INDEX_MAX_AGE_SECONDS = float(os.environ.get('SEARCH_INDEX_MAX_AGE_SECONDS', '900'))
+# Más entradas pendientes que esto (o un hueco en el feed que no se llena) reconstruye el índice
+SEARCH_MAX_FEED_ENTRIES = int(os.environ.get('SEARCH_MAX_FEED_ENTRIES', '100'))
+SEARCH_FEED_GAP_SECONDS = float(os.environ.get('SEARCH_FEED_GAP_SECONDS', '30'))
+SEARCH_SCAN_SEGMENTS = int(os.environ.get('SEARCH_SCAN_SEGMENTS', '4'))
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+# Similitud mínima (Jaccard de trigramas) para la búsqueda aproximada
+FUZZY_THRESHOLD = float(os.environ.get('SEARCH_FUZZY_THRESHOLD', '0.3'))
+
+SNAPSHOT_PROJECTION = schema.projection([schema.KEY_FIELD, 'nombre'])
+
+_index = None
+
+
+def normalize(text):
+    """Minúsculas, sin acentos y con espacios simples: 'Súper  Auto' -> 'super auto'."""
+    decomposed = unicodedata.normalize('NFKD', str(text).casefold())
+    return ' '.join(''.join(c for c in decomposed if not unicodedata.combining(c)).split())
+
+
+def trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Nombres de los carros ordenados (búsqueda por prefijo) y postings de trigramas (aproximada)."""
+
+    def __init__(self, cars, data_version):
+        self.version = data_version
+        self.built_at = self.checked_at = time.monotonic()
+        self.gap_since = None
+        self._names = {}  # id -> nombre normalizado
+        self._display = {}  # id -> nombre tal cual
+        self._trigram_counts = {}  # id -> trigramas distintos del nombre
+        self._postings = defaultdict(set)  # trigrama -> ids
+        self._sorted = []  # (nombre normalizado, id)
+        for car in cars:
+            self._add(car['id'], car.get('nombre'), sort=False)
+        self._sorted.sort()
+
+    def __len__(self):
+        return len(self._names)
+
+    def _add(self, car_id, nombre, sort=True):
+        if not isinstance(nombre, str):
+            return
+        name = normalize(nombre)
+        self._names[car_id] = name
+        self._display[car_id] = nombre
+        name_trigrams = trigrams(name)
+        self._trigram_counts[car_id] = len(name_trigrams)
+        for trigram in name_trigrams:
+            self._postings[trigram].add(car_id)
+        if sort:
+            bisect.insort(self._sorted, (name, car_id))
+        else:
+            self._sorted.append((name, car_id))
+
+    def _remove(self, car_id):
+        name = self._names.pop(car_id, None)
+        if name is None:
+            return
+        del self._display[car_id]
+        del self._trigram_counts[car_id]
+        for trigram in trigrams(name):
+            ids = self._postings[trigram]
+            ids.discard(car_id)
+            if not ids:
+                del self._postings[trigram]
+        position = bisect.bisect_left(self._sorted, (name, car_id))
+        del self._sorted[position]
+
+    def apply(self, changes):
+        """Aplica las entradas del feed; repetir una entrada no cambia el resultado."""
+        for change in changes:
+            self._remove(change['id'])
+            if not change.get('deleted'):
+                self._add(change['id'], change.get('nombre'))
+
+    def _item(self, car_id):
+        return {'id': car_id, 'nombre': self._display[car_id]}
+
+    def prefix(self, query, limit):
+        query = normalize(query)
+        position = bisect.bisect_left(self._sorted, (query,))
+        items = []
+        for name, car_id in self._sorted[position:position + limit]:
+            if not name.startswith(query):
+                break
+            items.append(self._item(car_id))
+        return items
+
+    def fuzzy(self, query, limit):
+        query_trigrams = trigrams(normalize(query))
+        # Jaccard >= umbral exige compartir al menos ceil(umbral * |consulta|) trigramas, así
+        # que todo candidato aparece en alguna de las |consulta| - mínimo + 1 listas más
+        # cortas: solo esas generan candidatos y las comunes (p. ej. '  t') solo suman
+        postings = sorted((self._postings.get(trigram, ()) for trigram in query_trigrams), key=len)
+        min_shared = max(1, math.ceil(FUZZY_THRESHOLD * len(query_trigrams)))
+        generating = len(postings) - min_shared + 1
+        shared = defaultdict(int)
+        for ids in postings[:generating]:
+            for car_id in ids:
+                shared[car_id] += 1
+        for ids in postings[generating:]:
+            for car_id in shared:
+                if car_id in ids:
+                    shared[car_id] += 1
+        scored = []
+        for car_id, count in shared.items():
+            # |A ∩ B| / |A ∪ B| con los trigramas de la consulta y del nombre
+            score = count / (len(query_trigrams) + self._trigram_counts[car_id] - count)
+            if score >= FUZZY_THRESHOLD:
+                scored.append((-score, self._names[car_id], car_id))
+        scored.sort()
+        return [dict(self._item(car_id), score=round(-score, 3)) for score, _, car_id in scored[:limit]]
+
+
+def build_index():
+    # La posición se lee antes del scan: lo escrito durante el scan llega después por el feed
+    data_version = version.feed_position()
+    started = time.monotonic()
+    cars = [car for page in iter_scan_pages(table, SEARCH_SCAN_SEGMENTS, scan_kwargs=SNAPSHOT_PROJECTION) for car in page]
+    index = NameIndex(cars, data_version)
+    logger.info("Search index built with %s cars at version %s in %.0f ms",
+                len(index), data_version, (time.monotonic() - started) * 1000)
+    return index
+
+
+def refresh(index):
+    """Aplica el feed de cambios pendiente; devuelve el mismo índice o uno reconstruido."""
+    now = time.monotonic()
+    index.checked_at = now
+    latest = version.feed_position()
+    if latest == index.version:
+        return index
+    if latest - index.version > SEARCH_MAX_FEED_ENTRIES:
+        logger.info("Search index %s versions behind, rebuilding", latest - index.version)
+        return build_index()
+
+    entries = version.read_changes(index.version, latest)
+    for data_version in range(index.version + 1, latest + 1):
+        entry = entries.get(data_version)
+        if entry is None:
+            # car_views aún no guardó la entrada (o falló): se espera un poco antes de reconstruir
+            if index.gap_since is None:
+                index.gap_since = now
+            elif now - index.gap_since >= SEARCH_FEED_GAP_SECONDS:
+                logger.warning("Change feed entry %s still missing, rebuilding search index", data_version)
+                return build_index()
+            return index
+        if entry.get('rebuild'):
+            return build_index()
+        index.apply(entry.get('changes', []))
+        index.version = data_version
+        index.gap_since = None
+    return index
+
+
+def current_index():
+    global _index
+    now = time.monotonic()
+    if _index is None or now - _index.built_at >= SEARCH_INDEX_MAX_AGE_SECONDS:
+        _index = build_index()
+    elif now - _index.checked_at >= SEARCH_REFRESH_SECONDS:
+        try:
+            _index = refresh(_index)
+        except (ClientError, RuntimeError) as e:
+            # Se sigue respondiendo con el índice que hay; se reintenta en el próximo intervalo
+            logger.warning("Could not refresh search index: %s", e)
+    return _index
+
+
+def parse_search_limit(value):
+    if value is None:
+        return DEFAULT_SEARCH_LIMIT
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    if not 1 <= limit <= MAX_SEARCH_LIMIT:
+        raise ValueError(f'limit must be between 1 and {MAX_SEARCH_LIMIT}')
+    return limit
+
+
+@deadline.bounded
+@log.sampled
+def lambda_handler(event, context):
+    try:
+        logger.debug("Received event: %s", event)
+
+        params = event.get('queryStringParameters') or {}
+        try:
+            query = (params.get('q') or '').strip()
+            if not query:
+                raise ValueError('q is required')
+            mode = params.get('mode', 'prefix')
+            if mode not in ('prefix', 'fuzzy'):
+                raise ValueError('mode must be prefix or fuzzy')
+            limit = parse_search_limit(params.get('limit'))
+        except ValueError as e:
+            logger.warning("Invalid query parameter: %s", e)
+            return responses.error(400, 'Invalid query parameter', str(e))
+
+        index = current_index()
+        items = index.prefix(query, limit) if mode == 'prefix' else index.fuzzy(query, limit)
+        logger.debug("Search %r (%s) returned %s items", query, mode, len(items))
+        return responses.json_response(200, {'items': items, 'version': index.version})
+
+    except ClientError as e:
+        logger.error("DynamoDB ClientError: %s", e)
+        return responses.client_error(e)
+
+    except Exception as e:
+        logger.error("Unexpected error: %s", e)
+        return responses.internal_error(e)
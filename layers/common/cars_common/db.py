@@ -0,0 +1,362 @@
+"""Acceso a datos de CarsTable sobre el cliente de bajo nivel de DynamoDB.
+
+Sustituye a ``boto3.resource('dynamodb').Table(...)``: el recurso añade peso de
+importación y transforma cada petición y respuesta con ``TypeSerializer`` /
+``TypeDeserializer``, que convierten todos los números a ``Decimal`` y obligaban
+a los handlers a recorrer el resultado otra vez. Aquí los atributos ``N``
+enteros se convierten directamente a ``int`` y solo los fraccionarios a
+``Decimal``: un float redondearía los que tienen más de 15-17 dígitos y, al
+volver a escribirlos (reintentos, cursores con claves numéricas), cambiaría el dato.
+
+``Table`` expone la misma interfaz que el recurso para las operaciones que usan
+los handlers y solo depende del cliente, que es thread-safe.
+
+``make_client`` fija timeouts cortos, keep-alive, el tamaño del pool y reintentos
+adaptativos en lugar de los valores por defecto de botocore (60 s de lectura,
+reintentos legacy, 10 conexiones), que con throttling dejaban una petición
+colgada casi un minuto. Todos se pueden ajustar por variables de entorno.
+
+El cliente de los handlers respeta el plazo de ``cars_common.deadline``: antes
+de cada intento comprueba que quede tiempo y, cuando queda poco, usa un cliente
+con un read timeout menor para no esperar más allá del plazo.
+"""
+import os
+import math
+import queue
+import random
+import threading
+from decimal import Decimal
+
+import boto3
+from botocore.config import Config
+
+from cars_common import deadline
+
+TABLE_NAME = os.environ.get('TABLE_NAME', 'CarsTable')
+
+# Configuración del cliente. Una llamada a DynamoDB tarda milisegundos; 1 MB de scan,
+# menos de un segundo, así que 5 s de lectura ya indica un problema.
+CONNECT_TIMEOUT = float(os.environ.get('DYNAMODB_CONNECT_TIMEOUT', '1'))
+READ_TIMEOUT = float(os.environ.get('DYNAMODB_READ_TIMEOUT', '5'))
+# Máximo de intentos (incluido el primero) con reintentos adaptativos: ante throttling
+# el cliente también limita su propio ritmo de envío
+MAX_ATTEMPTS = int(os.environ.get('DYNAMODB_MAX_ATTEMPTS', '3'))
+RETRY_MODE = os.environ.get('DYNAMODB_RETRY_MODE', 'adaptive')
+# Debe cubrir el camino más paralelo (scan de get_cars con MAX_SCAN_SEGMENTS=10 hilos)
+MAX_POOL_CONNECTIONS = int(os.environ.get('DYNAMODB_MAX_POOL_CONNECTIONS', '16'))
+# Read timeouts disponibles cuando el plazo restante es menor que READ_TIMEOUT
+READ_TIMEOUT_TIERS = sorted({READ_TIMEOUT} | {t for t in (2.0, 1.0, 0.5) if t < READ_TIMEOUT}, reverse=True)
+
+# BatchGetItem: máximo de claves por llamada y reintentos de las UnprocessedKeys
+# (Table.batch_get_all), con full jitter para que los hilos no reintenten a la vez
+BATCH_GET_SIZE = 100
+BATCH_MAX_RETRIES = int(os.environ.get('BATCH_MAX_RETRIES', '6'))
+BATCH_BASE_DELAY = 0.05
+
+# Parámetros y campos de respuesta que contienen elementos con tipos de DynamoDB
+_ITEM_PARAMS = ('Key', 'Item', 'ExclusiveStartKey', 'ExpressionAttributeValues')
+_SEGMENT_DONE = object()
+
+
+def client_config(**overrides):
+    """Config de botocore para DynamoDB; ``overrides`` reemplaza cualquier opción."""
+    options = {
+        'connect_timeout': CONNECT_TIMEOUT,
+        'read_timeout': READ_TIMEOUT,
+        'retries': {'mode': RETRY_MODE, 'total_max_attempts': MAX_ATTEMPTS},
+        'max_pool_connections': MAX_POOL_CONNECTIONS,
+        'tcp_keepalive': True,
+    }
+    options.update(overrides)
+    return Config(**options)
+
+
+def make_client(endpoint_url=None, region_name=None, **config_overrides):
+    """Cliente de DynamoDB con la configuración compartida."""
+    dynamodb_client = boto3.client(
+        'dynamodb',
+        endpoint_url=endpoint_url,
+        region_name=region_name,
+        config=client_config(**config_overrides)
+    )
+    # Se emite en cada intento, también en los reintentos
+    dynamodb_client.meta.events.register('before-send.dynamodb', _check_deadline)
+    return dynamodb_client
+
+
+def _check_deadline(**kwargs):
+    deadline.check()
+
+
+class DeadlineClient:
+    """Delega cada llamada en el cliente cuyo read timeout cabe en el plazo restante.
+
+    Los clientes de timeouts menores se crean al primer uso; cada uno tiene su
+    propio pool de conexiones.
+    """
+
+    def __init__(self, **client_kwargs):
+        self._client_kwargs = client_kwargs
+        self._clients = {}
+        self._lock = threading.Lock()
+        self._for_timeout(READ_TIMEOUT_TIERS[0])
+
+    def _for_timeout(self, read_timeout):
+        dynamodb_client = self._clients.get(read_timeout)
+        if dynamodb_client is None:
+            with self._lock:
+                dynamodb_client = self._clients.get(read_timeout)
+                if dynamodb_client is None:
+                    dynamodb_client = make_client(
+                        read_timeout=read_timeout,
+                        connect_timeout=min(CONNECT_TIMEOUT, read_timeout),
+                        **self._client_kwargs
+                    )
+                    self._clients[read_timeout] = dynamodb_client
+        return dynamodb_client
+
+    def current(self):
+        remaining = deadline.remaining_seconds()
+        for read_timeout in READ_TIMEOUT_TIERS:
+            if read_timeout <= remaining:
+                return self._for_timeout(read_timeout)
+        return self._for_timeout(READ_TIMEOUT_TIERS[-1])
+
+    def __getattr__(self, name):
+        return getattr(self.current(), name)
+
+
+def _number(text):
+    # int para enteros (ids numéricos, capacidad) y Decimal, sin pérdida, para el resto
+    if '.' in text or 'e' in text or 'E' in text:
+        return Decimal(text)
+    return int(text)
+
+
+def serialize(value):
+    """Convierte un valor de Python en un atributo de DynamoDB."""
+    if isinstance(value, str):
+        return {'S': value}
+    if isinstance(value, bool):
+        return {'BOOL': value}
+    if isinstance(value, int):
+        return {'N': str(value)}
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError(f'DynamoDB does not support {value} as a number')
+        return {'N': repr(value)}
+    if isinstance(value, Decimal):
+        return {'N': str(value)}
+    if value is None:
+        return {'NULL': True}
+    if isinstance(value, dict):
+        return {'M': {k: serialize(v) for k, v in value.items()}}
+    if isinstance(value, (list, tuple)):
+        return {'L': [serialize(v) for v in value]}
+    if isinstance(value, (bytes, bytearray)):
+        return {'B': bytes(value)}
+    if isinstance(value, (set, frozenset)):
+        if all(isinstance(v, str) for v in value):
+            return {'SS': list(value)}
+        return {'NS': [serialize(v)['N'] for v in value]}
+    raise TypeError(f'Unsupported type for DynamoDB: {type(value).__name__}')
+
+
+def deserialize(attribute):
+    """Convierte un atributo de DynamoDB en un valor de Python."""
+    (tag, value), = attribute.items()
+    # S y N primero: son los únicos tipos del esquema de carros
+    if tag == 'S':
+        return value
+    if tag == 'N':
+        return _number(value)
+    if tag == 'BOOL':
+        return value
+    if tag == 'NULL':
+        return None
+    if tag == 'M':
+        return {k: deserialize(v) for k, v in value.items()}
+    if tag == 'L':
+        return [deserialize(v) for v in value]
+    if tag == 'B':
+        return value
+    if tag == 'SS':
+        return set(value)
+    if tag == 'NS':
+        return {_number(v) for v in value}
+    if tag == 'BS':
+        return set(value)
+    raise TypeError(f'Unknown DynamoDB type: {tag}')
+
+
+def serialize_item(item):
+    return {k: serialize(v) for k, v in item.items()}
+
+
+def deserialize_item(item):
+    return {k: deserialize(v) for k, v in item.items()}
+
+
+def _serialize_params(kwargs):
+    for name in _ITEM_PARAMS:
+        if name in kwargs:
+            kwargs[name] = serialize_item(kwargs[name])
+    return kwargs
+
+
+def _deserialize_response(response):
+    if 'Items' in response:
+        response['Items'] = [deserialize_item(item) for item in response['Items']]
+    for name in ('Item', 'Attributes', 'LastEvaluatedKey'):
+        if name in response:
+            response[name] = deserialize_item(response[name])
+    return response
+
+
+class Table:
+    """Tabla de DynamoDB con entrada y salida en tipos nativos de Python."""
+
+    def __init__(self, name, dynamodb_client):
+        self.name = name
+        self.client = dynamodb_client
+
+    def get_item(self, **kwargs):
+        return _deserialize_response(self.client.get_item(TableName=self.name, **_serialize_params(kwargs)))
+
+    def put_item(self, **kwargs):
+        return _deserialize_response(self.client.put_item(TableName=self.name, **_serialize_params(kwargs)))
+
+    def update_item(self, **kwargs):
+        return _deserialize_response(self.client.update_item(TableName=self.name, **_serialize_params(kwargs)))
+
+    def delete_item(self, **kwargs):
+        return _deserialize_response(self.client.delete_item(TableName=self.name, **_serialize_params(kwargs)))
+
+    def scan(self, **kwargs):
+        return _deserialize_response(self.client.scan(TableName=self.name, **_serialize_params(kwargs)))
+
+    def query(self, **kwargs):
+        return _deserialize_response(self.client.query(TableName=self.name, **_serialize_params(kwargs)))
+
+    def describe(self):
+        return self.client.describe_table(TableName=self.name)['Table']
+
+    def batch_get(self, keys, **kwargs):
+        """Un BatchGetItem (máx. 100 claves); devuelve (elementos, claves sin procesar)."""
+        request = dict(kwargs, Keys=[serialize_item(key) for key in keys])
+        response = self.client.batch_get_item(RequestItems={self.name: request})
+        items = [deserialize_item(item) for item in response['Responses'].get(self.name, [])]
+        unprocessed = response.get('UnprocessedKeys', {}).get(self.name, {}).get('Keys', [])
+        return items, [deserialize_item(key) for key in unprocessed]
+
+    def batch_get_all(self, keys, **kwargs):
+        """Todos los elementos existentes de ``keys``, en bloques de BATCH_GET_SIZE claves.
+
+        Las claves sin procesar se reintentan con backoff exponencial; la espera
+        respeta el plazo (``deadline.sleep``). RuntimeError si siguen sin procesar
+        tras BATCH_MAX_RETRIES reintentos. Las claves que no están en la
+        respuesta son elementos que no existen.
+        """
+        items = []
+        for i in range(0, len(keys), BATCH_GET_SIZE):
+            pending = keys[i:i + BATCH_GET_SIZE]
+            for attempt in range(BATCH_MAX_RETRIES + 1):
+                chunk_items, pending = self.batch_get(pending, **kwargs)
+                items.extend(chunk_items)
+                if not pending:
+                    break
+                if attempt < BATCH_MAX_RETRIES:
+                    deadline.sleep(random.uniform(0, BATCH_BASE_DELAY * 2 ** attempt))
+            else:
+                raise RuntimeError(f'{len(pending)} keys still unprocessed after {BATCH_MAX_RETRIES} retries')
+        return items
+
+    def batch_put(self, items, key_name='id'):
+        """Un BatchWriteItem (máx. 25 elementos); devuelve los elementos sin procesar.
+
+        Se devuelven los elementos originales, identificados por ``key_name``, y no
+        los de la respuesta deserializados: el reintento escribe exactamente lo mismo.
+        """
+        requests = [{'PutRequest': {'Item': serialize_item(item)}} for item in items]
+        response = self.client.batch_write_item(RequestItems={self.name: requests})
+        unprocessed = response.get('UnprocessedItems', {}).get(self.name, [])
+        if not unprocessed:
+            return []
+        unprocessed_keys = {deserialize(request['PutRequest']['Item'][key_name]) for request in unprocessed}
+        return [item for item in items if item[key_name] in unprocessed_keys]
+
+
+def transact_write(actions):
+    """Un TransactWriteItems (máx. 100 acciones) sobre una o varias tablas del mismo cliente.
+
+    ``actions`` son tuplas (acción, Table, parámetros), con acción Put, Update, Delete
+    o ConditionCheck y los parámetros en tipos nativos, como en los métodos de ``Table``.
+    """
+    transact_items = [
+        {kind: dict(_serialize_params(dict(params)), TableName=target.name)} for kind, target, params in actions
+    ]
+    return actions[0][1].client.transact_write_items(TransactItems=transact_items)
+
+
+def _scan_segment_pages(table, segment, total_segments, pages, stop, base_kwargs):
+    scan_kwargs = dict(base_kwargs, Segment=segment, TotalSegments=total_segments)
+    try:
+        while not stop.is_set():
+            response = table.scan(**scan_kwargs)
+            _put_until_stopped(pages, response['Items'], stop)
+            last_evaluated_key = response.get('LastEvaluatedKey')
+            if not last_evaluated_key:
+                break
+            scan_kwargs['ExclusiveStartKey'] = last_evaluated_key
+    except BaseException as e:
+        # BaseException incluye DeadlineExceeded; el consumidor la relanza
+        _put_until_stopped(pages, e, stop)
+    _put_until_stopped(pages, _SEGMENT_DONE, stop)
+
+
+def _put_until_stopped(pages, value, stop):
+    # Si el consumidor abandona la lectura, los hilos no quedan bloqueados en la cola llena
+    while not stop.is_set():
+        try:
+            pages.put(value, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+def iter_scan_pages(table, total_segments, max_pending_pages=None, scan_kwargs=None):
+    """Genera las páginas de un scan paralelo a medida que llegan.
+
+    Cada segmento se lee en su propio hilo; la cola acotada hace que la memoria
+    dependa del número de páginas pendientes y no del tamaño de la tabla.
+    ``scan_kwargs`` se añade a cada Scan (p. ej. un ProjectionExpression).
+    """
+    pages = queue.Queue(maxsize=max_pending_pages or total_segments * 2)
+    stop = threading.Event()
+    threads = [
+        threading.Thread(
+            target=_scan_segment_pages,
+            args=(table, segment, total_segments, pages, stop, scan_kwargs or {}),
+            daemon=True
+        )
+        for segment in range(total_segments)
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        remaining_segments = total_segments
+        while remaining_segments:
+            page = pages.get()
+            if page is _SEGMENT_DONE:
+                remaining_segments -= 1
+            elif isinstance(page, BaseException):
+                raise page
+            else:
+                yield page
+    finally:
+        stop.set()
+
+
+client = DeadlineClient()
+table = Table(TABLE_NAME, client)
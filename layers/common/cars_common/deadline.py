@@ -0,0 +1,84 @@
+"""Plazo por invocación derivado del tiempo restante de Lambda.
+
+API Gateway corta la petición a los 29 s y Lambda al llegar a su ``Timeout``;
+pasado ese punto cualquier trabajo con DynamoDB se desperdicia. ``bounded``
+fija el plazo al empezar cada invocación (tiempo restante, como mucho 29 s,
+menos un margen) y convierte ``DeadlineExceeded`` en un 503 con
+``Retry-After``. El cliente de ``cars_common.db`` consulta el plazo antes de
+enviar cada intento, así que tampoco se reintenta fuera de tiempo.
+
+``DeadlineExceeded`` hereda de ``BaseException`` (como ``gevent.Timeout``)
+para que los ``except Exception`` de los handlers no la conviertan en un 500.
+"""
+import os
+import math
+import time
+import functools
+
+from cars_common import responses
+
+API_GATEWAY_TIMEOUT_MS = 29000
+SAFETY_MARGIN_MS = int(os.environ.get('DEADLINE_MARGIN_MS', '500'))
+RETRY_AFTER_SECONDS = int(os.environ.get('RETRY_AFTER_SECONDS', '1'))
+_RETRY_AFTER_HEADERS = dict(responses.COMMON_HEADERS, **{'Retry-After': str(RETRY_AFTER_SECONDS)})
+
+# Instante límite (time.monotonic) de la invocación en curso; None fuera de Lambda
+_deadline = None
+
+
+class DeadlineExceeded(BaseException):
+    """No queda tiempo para completar la invocación."""
+
+
+def start(context, cap_ms=API_GATEWAY_TIMEOUT_MS):
+    """Fija el plazo de la invocación; ``cap_ms=None`` usa todo el tiempo de Lambda.
+
+    El tope por defecto es el de API Gateway; las funciones sin API delante
+    (el consumidor del stream) pasan ``cap_ms=None``.
+    """
+    global _deadline
+    if context is None:
+        _deadline = None
+        return
+    remaining_ms = context.get_remaining_time_in_millis()
+    if cap_ms is not None:
+        remaining_ms = min(remaining_ms, cap_ms)
+    remaining_ms -= SAFETY_MARGIN_MS
+    _deadline = time.monotonic() + remaining_ms / 1000
+
+
+def clear():
+    global _deadline
+    _deadline = None
+
+
+def remaining_seconds():
+    if _deadline is None:
+        return math.inf
+    return _deadline - time.monotonic()
+
+
+def check():
+    if remaining_seconds() <= 0:
+        raise DeadlineExceeded()
+
+
+def sleep(seconds):
+    """time.sleep que falla de inmediato si la espera terminaría después del plazo."""
+    if seconds >= remaining_seconds():
+        raise DeadlineExceeded()
+    time.sleep(seconds)
+
+
+def bounded(handler):
+    """Decorador de lambda_handler: fija el plazo y responde 503 si se agota."""
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        start(context)
+        try:
+            return handler(event, context)
+        except DeadlineExceeded:
+            return responses.raw(503, responses.DEADLINE_EXCEEDED, _RETRY_AFTER_HEADERS)
+        finally:
+            clear()
+    return wrapper
@@ -0,0 +1,45 @@
+"""Serialización JSON de los cuerpos de respuesta en una sola pasada.
+
+Usa orjson si está instalado (viene en la capa) y si no ``json`` de la
+biblioteca estándar, siempre con salida compacta. Los ``Decimal`` (números
+fraccionarios de ``cars_common.db`` o del recurso de boto3 en los scripts) se
+convierten en el propio hook ``default`` del serializador, sin copiar antes la
+estructura: los enteros siguen siendo enteros y el resto pasa a float. Lo que
+orjson no puede escribir (enteros de más de 64 bits) se escribe con ``json``.
+"""
+import json
+from decimal import Decimal
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa json
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+_encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False, default=_default)
+_sorted_encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False, default=_default, sort_keys=True)
+
+
+def _stdlib_dumps(obj, sort_keys=False):
+    return (_sorted_encoder if sort_keys else _encoder).encode(obj)
+
+
+if orjson is not None:
+    def dumps(obj, sort_keys=False):
+        option = orjson.OPT_SORT_KEYS if sort_keys else 0
+        try:
+            return orjson.dumps(obj, default=_default, option=option).decode('utf-8')
+        except TypeError:
+            # orjson no serializa enteros de más de 64 bits, que DynamoDB sí guarda
+            # (hasta 38 dígitos); json los escribe sin pérdida
+            return _stdlib_dumps(obj, sort_keys)
+else:
+    dumps = _stdlib_dumps
@@ -0,0 +1,180 @@
+"""Respuestas condicionales (ETag / If-None-Match) para los endpoints de lectura.
+
+El ETag es un hash del cuerpo ya serializado, así que es fuerte: cambia si y
+solo si cambia el contenido. Cuando el cliente envía un ``If-None-Match`` que
+coincide, se responde ``304 Not Modified`` sin cuerpo y el panel que consulta
+cada pocos segundos no vuelve a descargar el inventario.
+
+``compress`` comprime con brotli o gzip, según ``Accept-Encoding``, los cuerpos
+que superan ``COMPRESSION_MIN_BYTES`` y los devuelve en base64
+(``isBase64Encoded``). API Gateway solo los entrega como binario si el primer
+tipo de ``Accept`` está en los ``BinaryMediaTypes`` de la API
+(``BINARY_MEDIA_TYPES``); con otro ``Accept`` el cuerpo va sin comprimir. No se
+declara ``*/*`` porque convierte en binarias las respuestas MOCK del preflight
+OPTIONS de CORS, que entonces fallan con 500. Los cuerpos de las peticiones con
+esos tipos también llegan en base64: ``request_body`` los decodifica.
+
+Un 304 lleva el mismo ``ETag`` y el mismo ``Vary`` que el 200 que valida.
+"""
+import os
+import gzip
+import base64
+import hashlib
+
+from cars_common import responses
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se ofrece gzip
+    brotli = None
+
+COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', '4096'))
+# Niveles bajos: a 256 MB la función tiene ~1/7 de vCPU y en listados de carros gzip-1 /
+# brotli-1 ya ahorran >70% de los bytes con la mitad de CPU que gzip-5 / brotli-4
+# (ver scripts/bench_compression.py)
+GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL', '1'))
+BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', '1'))
+# Deben coincidir con BinaryMediaTypes de CarsApi en template.yaml
+BINARY_MEDIA_TYPES = frozenset(
+    media_type.strip().lower() for media_type in os.environ.get('BINARY_MEDIA_TYPES', 'application/json').split(',')
+)
+# La respuesta comprimible depende de Accept (binario o no) y de Accept-Encoding
+VARY = 'Accept, Accept-Encoding'
+
+
+def header(event, name):
+    """Valor de una cabecera de la petición sin distinguir mayúsculas."""
+    name = name.lower()
+    for key, value in (event.get('headers') or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def etag_for(body):
+    return '"' + hashlib.blake2b(body.encode('utf-8'), digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match, etag):
+    # If-None-Match usa la comparación débil (RFC 9110): se ignora el prefijo W/
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def conditional_response(event, body, etag=None):
+    """Respuesta 200 con ETag, o 304 si el cliente ya tiene esa versión.
+
+    El 304 no tiene cuerpo que comprimir: lleva las cabeceras que ``compress``
+    pondría en el 200 (ETag débil y Vary).
+    """
+    etag = etag or etag_for(body)
+    headers = dict(responses.COMMON_HEADERS, **{'ETag': etag, 'Access-Control-Expose-Headers': 'ETag'})
+    if etag_matches(header(event, 'If-None-Match'), etag):
+        headers = representation_headers(headers, body, negotiated_encoding(event, body))
+        headers.pop('Content-Encoding', None)  # un 304 no tiene cuerpo
+        return responses.raw(304, '', headers)
+    return responses.raw(200, body, headers)
+
+
+def request_body(event, default='{}'):
+    """Cuerpo de la petición como texto, decodificando base64 si API Gateway lo codificó."""
+    body = event.get('body')
+    if body is None:
+        return default
+    if event.get('isBase64Encoded'):
+        return base64.b64decode(body).decode('utf-8')
+    return body
+
+
+def accepted_encodings(accept_encoding):
+    """Codificaciones aceptadas (q > 0) de una cabecera Accept-Encoding."""
+    accepted = set()
+    for part in (accept_encoding or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def choose_encoding(event):
+    accepted = accepted_encodings(header(event, 'Accept-Encoding'))
+    if brotli is not None and ('br' in accepted or '*' in accepted):
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def accepts_binary(event):
+    # API Gateway solo mira el primer tipo de Accept para decidir si decodifica el base64
+    accept = header(event, 'Accept') or ''
+    return accept.split(',')[0].partition(';')[0].strip().lower() in BINARY_MEDIA_TYPES
+
+
+def negotiated_encoding(event, body):
+    """Codificación con la que se envía el cuerpo, o None si va sin comprimir."""
+    if len(body) < COMPRESSION_MIN_BYTES or not accepts_binary(event):
+        return None
+    return choose_encoding(event)
+
+
+def representation_headers(headers, body, encoding):
+    """Cabeceras de una respuesta con este cuerpo enviado con ``encoding``."""
+    headers = dict(headers)
+    if len(body) >= COMPRESSION_MIN_BYTES:
+        headers['Vary'] = VARY
+    if encoding is not None:
+        headers['Content-Encoding'] = encoding
+        # Como nginx: el ETag fuerte pasa a débil porque los bytes ya no son los mismos;
+        # If-None-Match usa comparación débil y sigue coincidiendo
+        if headers.get('ETag', '').startswith('"'):
+            headers['ETag'] = 'W/' + headers['ETag']
+    return headers
+
+
+def encode_body(body, encoding):
+    raw = body.encode('utf-8')
+    if encoding == 'br':
+        compressed = brotli.compress(raw, quality=BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+    return base64.b64encode(compressed).decode('ascii')
+
+
+def compress(event, response, encoded_bodies=None):
+    """Comprime el cuerpo de la respuesta si el cliente lo acepta y vale la pena.
+
+    ``encoded_bodies`` es un dict opcional {codificación: cuerpo en base64} que el
+    llamador puede guardar junto a una respuesta cacheada para no recomprimirla.
+    """
+    body = response.get('body') or ''
+    if len(body) < COMPRESSION_MIN_BYTES or response.get('isBase64Encoded'):
+        return response
+    encoding = negotiated_encoding(event, body)
+    headers = representation_headers(response.get('headers') or {}, body, encoding)
+    if encoding is None:
+        return dict(response, headers=headers)
+
+    if encoded_bodies is not None and encoding in encoded_bodies:
+        encoded = encoded_bodies[encoding]
+    else:
+        encoded = encode_body(body, encoding)
+        if encoded_bodies is not None:
+            encoded_bodies[encoding] = encoded
+    return dict(response, body=encoded, headers=headers, isBase64Encoded=True)
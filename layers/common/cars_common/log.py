@@ -0,0 +1,78 @@
+"""Logging estructurado (una línea JSON por registro) para los handlers.
+
+El nivel sale de ``LOG_LEVEL`` (INFO por defecto). ``sampled`` activa DEBUG
+solo en una fracción de las invocaciones (``LOG_DEBUG_SAMPLE_RATE``, 1% por
+defecto) para poder seguir peticiones completas en producción sin pagar el
+formateo de DEBUG en todas. Los mensajes usan argumentos ``%s``: logging solo
+los formatea si el nivel está activo, así que un payload grande en un DEBUG
+desactivado no cuesta nada.
+"""
+import os
+import json
+import random
+import logging
+import functools
+
+LOG_LEVEL = logging.getLevelName(os.environ.get('LOG_LEVEL', 'INFO').upper())
+DEBUG_SAMPLE_RATE = float(os.environ.get('LOG_DEBUG_SAMPLE_RATE', '0.01'))
+# El DEBUG de estas librerías vuelca cada petición HTTP: no se activa con el muestreo
+QUIET_LOGGERS = ('boto3', 'botocore', 'urllib3')
+
+# Invocación en curso: se añade a cada registro
+_request = {'request_id': None, 'debug_sampled': False}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'timestamp': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if _request['request_id']:
+            entry['request_id'] = _request['request_id']
+        if _request['debug_sampled']:
+            entry['debug_sampled'] = True
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def _setup():
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(max(LOG_LEVEL, logging.INFO))
+    if not root.handlers:
+        root.addHandler(logging.StreamHandler())
+    elif not os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+        # Fuera de Lambda (scripts) se respeta la configuración de quien importa
+        return
+    for handler in root.handlers:
+        handler.setFormatter(JsonFormatter())
+
+
+def get_logger():
+    return logging.getLogger()
+
+
+def sampled(handler):
+    """Decorador de lambda_handler: etiqueta los registros con el request id y muestrea DEBUG."""
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        root = logging.getLogger()
+        _request['request_id'] = getattr(context, 'aws_request_id', None)
+        _request['debug_sampled'] = LOG_LEVEL > logging.DEBUG and random.random() < DEBUG_SAMPLE_RATE
+        if _request['debug_sampled']:
+            root.setLevel(logging.DEBUG)
+        try:
+            return handler(event, context)
+        finally:
+            root.setLevel(LOG_LEVEL)
+            _request['request_id'] = None
+            _request['debug_sampled'] = False
+    return wrapper
+
+
+_setup()
@@ -0,0 +1,54 @@
+"""Respuestas de API Gateway compartidas por todos los handlers.
+
+Un único objeto de cabeceras y los cuerpos de los mensajes fijos serializados
+una sola vez al importar, para que todas las funciones respondan igual y el
+camino habitual no vuelva a codificar JSON que no cambia. Los cuerpos
+dinámicos pasan por ``cars_common.encoding``.
+
+Las respuestas comparten ``COMMON_HEADERS``: quien necesite otras cabeceras
+debe copiarlo (``dict(COMMON_HEADERS, ...)``), nunca modificarlo.
+"""
+from cars_common import encoding
+
+COMMON_HEADERS = {
+    'Access-Control-Allow-Headers': '*',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'OPTIONS,POST,GET,PUT,DELETE'
+}
+
+# Cuerpos fijos
+CAR_NOT_FOUND = encoding.dumps({'error': 'Car not found'})
+CAR_UPDATED = encoding.dumps({'message': 'Carro actualizado correctamente'})
+CAR_DELETED = encoding.dumps({'message': 'Carro eliminado exitosamente'})
+NO_CARS = encoding.dumps({'message': 'No hay carros registrados aun.'})
+MISSING_ID = encoding.dumps({'error': 'Missing path parameter', 'details': 'ID is required'})
+DEADLINE_EXCEEDED = encoding.dumps({'error': 'Service unavailable', 'details': 'Request deadline exceeded'})
+
+
+def raw(status_code, body, headers=None):
+    """Respuesta con un cuerpo ya serializado (constantes de este módulo o cuerpos cacheados)."""
+    return {
+        'statusCode': status_code,
+        'body': body,
+        'headers': headers or COMMON_HEADERS
+    }
+
+
+def json_response(status_code, payload):
+    return raw(status_code, encoding.dumps(payload))
+
+
+def error(status_code, message, details=None):
+    payload = {'error': message}
+    if details is not None:
+        payload['details'] = details
+    return json_response(status_code, payload)
+
+
+def client_error(e):
+    """500 por un error de DynamoDB."""
+    return error(500, 'DynamoDB error', str(e))
+
+
+def internal_error(e):
+    return error(500, 'Internal server error', str(e))
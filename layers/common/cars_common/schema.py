@@ -0,0 +1,128 @@
+"""Atributos conocidos de un carro, normalización y proyecciones de lectura (``?fields=``).
+
+``potencia`` y ``capacidad`` se guardan siempre como números (tipo N): son la
+clave de ordenación de los índices por rango, que rechazan cualquier otro
+tipo. Se aceptan números o textos numéricos (``"150"``) y se guardan como
+``int`` si son enteros o ``Decimal`` si no, que entienden tanto
+``cars_common.db`` como el serializador del recurso de boto3.
+
+Los lectores que solo necesitan algunos atributos (p. ej. ``id`` y ``nombre``
+para un listado) los piden con ``fields``; se traduce en un
+``ProjectionExpression`` para que DynamoDB devuelva, y el handler serialice,
+solo esos atributos. Los nombres van siempre por ``ExpressionAttributeNames``
+y se validan contra el esquema, así que nunca llega texto del cliente a la
+expresión.
+
+``RANGE_INDEX_NAMES`` son los GSI con ``tipo`` como partición y cada atributo
+numérico como clave de ordenación, que usan GET /car y GET /car/stats.
+"""
+import os
+from decimal import Decimal, InvalidOperation
+
+CAR_FIELDS = ('nombre', 'tipo', 'potencia', 'capacidad')
+NUMERIC_FIELDS = ('potencia', 'capacidad')
+KEY_FIELD = 'id'
+RANGE_INDEX_NAMES = {
+    'potencia': os.environ.get('TIPO_POTENCIA_INDEX_NAME', 'TipoPotenciaIndex'),
+    'capacidad': os.environ.get('TIPO_CAPACIDAD_INDEX_NAME', 'TipoCapacidadIndex'),
+}
+# Límites del tipo N de DynamoDB: 38 dígitos significativos y magnitudes entre 1E-130 y
+# 9.99...E+125. Se comprueban antes de convertir a int: int(Decimal('1e999999999'))
+# construiría un entero de mil millones de dígitos
+MAX_NUMBER_DIGITS = 38
+MAX_NUMBER_EXPONENT = 125
+MIN_NUMBER_EXPONENT = -130
+
+
+def to_number(value):
+    """int o Decimal a partir de un número o de un texto numérico; ValueError si no lo es."""
+    if isinstance(value, bool) or not isinstance(value, (int, float, Decimal, str)):
+        raise ValueError(f'{value!r} is not a number')
+    if isinstance(value, int):
+        _check_storable(Decimal(value), value)
+        return value
+    if isinstance(value, float):
+        # repr da el decimal más corto que representa al float (1.1 y no 1.100000000000000088...)
+        value = repr(value)
+    elif isinstance(value, str):
+        value = value.strip()
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f'{value!r} is not a number')
+    if not number.is_finite():
+        raise ValueError(f'{value!r} is not a finite number')
+    _check_storable(number, value)
+    if number == number.to_integral_value():
+        return int(number)
+    return number
+
+
+def _check_storable(number, value):
+    """ValueError si DynamoDB no puede guardar el número sin perder precisión."""
+    if not number:
+        return
+    # Los ceros finales no cuentan: 1000 y 1E+3 tienen un solo dígito significativo
+    significant = len(''.join(map(str, number.as_tuple().digits)).rstrip('0'))
+    if significant > MAX_NUMBER_DIGITS:
+        raise ValueError(f'{value!r} has more than {MAX_NUMBER_DIGITS} significant digits')
+    if not MIN_NUMBER_EXPONENT <= number.adjusted() <= MAX_NUMBER_EXPONENT:
+        raise ValueError(f'{value!r} is out of the supported number range')
+
+
+def parse_tipo(value):
+    """``tipo`` sin espacios alrededor; ValueError si no es un texto o queda vacío."""
+    if not isinstance(value, str):
+        raise ValueError('tipo must be a string')
+    tipo = value.strip()
+    if not tipo:
+        raise ValueError('tipo must not be empty')
+    return tipo
+
+
+def normalize_car(body):
+    """Valores de los campos del carro con ``potencia`` y ``capacidad`` convertidos a número.
+
+    ``tipo`` es la partición de los índices por rango y de stats#<tipo>: se guarda
+    como texto no vacío, igual que lo normaliza ``?tipo=``.
+
+    KeyError si falta un campo, ValueError si un campo numérico no es un número o
+    ``tipo`` no es un texto no vacío.
+    """
+    car = {}
+    for field in CAR_FIELDS:
+        value = body[field]
+        if field == 'tipo':
+            value = parse_tipo(value)
+        elif field in NUMERIC_FIELDS:
+            try:
+                value = to_number(value)
+            except ValueError:
+                raise ValueError(f'{field} must be a number')
+        car[field] = value
+    return car
+
+
+def parse_fields(value):
+    """Convierte ``nombre,tipo`` en la lista de atributos a leer; ``id`` siempre se incluye."""
+    if not value.strip():
+        raise ValueError('fields must contain at least one field')
+    fields = [KEY_FIELD]
+    for field in value.split(','):
+        field = field.strip()
+        if not field or field in fields:
+            continue
+        if field not in CAR_FIELDS:
+            raise ValueError(f'fields accepts only {", ".join((KEY_FIELD,) + CAR_FIELDS)}')
+        fields.append(field)
+    return fields
+
+
+def projection(fields):
+    """Parámetros de ProjectionExpression para get_item/scan/query/batch_get ({} sin fields)."""
+    if not fields:
+        return {}
+    return {
+        'ProjectionExpression': ', '.join('#' + field for field in fields),
+        'ExpressionAttributeNames': {'#' + field: field for field in fields}
+    }
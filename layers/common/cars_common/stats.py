@@ -0,0 +1,114 @@
+"""Contadores agregados por tipo de carro en CarsMetaTable (GET /car/stats).
+
+Cada tipo tiene un elemento ``stats#<tipo>`` con ``count``, las sumas de
+``potencia`` y ``capacidad`` y ``top_potencia``, los TOP_N carros de más
+potencia. Los mantiene el consumidor del stream de CarsTable (``car_views``)
+con la imagen anterior y la nueva de cada carro, así que los handlers de
+escritura no leen antes de escribir, y leer las estadísticas es un
+BatchGetItem de unos pocos elementos en lugar de un scan. ``stats#tipos``
+guarda el conjunto de tipos vistos.
+
+Mínimos y máximos no se pueden mantener con ``ADD`` (y no bajarían al borrar):
+se leen de los índices por rango con una Query de un elemento.
+"""
+import os
+import logging
+
+from botocore.exceptions import ClientError
+
+from cars_common import schema
+from cars_common.version import meta_table
+
+STATS_PREFIX = 'stats#'
+TIPOS_KEY = {'pk': 'stats#tipos'}
+COUNTERS = ('count', 'sum_potencia', 'sum_capacidad')
+# Campos del carro de los que dependen los contadores
+STATS_FIELDS = ('tipo', 'potencia', 'capacidad')
+# Carros por tipo en top_potencia
+TOP_N = int(os.environ.get('STATS_TOP_N', '10'))
+TOP_FIELDS = ('id', 'nombre', 'potencia')
+# Escrituras concurrentes del mismo tipo chocan en su contador (TransactionConflict)
+TRANSACT_MAX_RETRIES = int(os.environ.get('STATS_TRANSACT_MAX_RETRIES', '5'))
+TRANSACT_BASE_DELAY = 0.02
+
+logger = logging.getLogger(__name__)
+
+# Tipos que este contenedor ya agregó a stats#tipos
+_registered_tipos = set()
+
+
+def stats_key(tipo):
+    return {'pk': STATS_PREFIX + str(tipo)}
+
+
+def number_or_zero(value):
+    # Un registro antiguo con texto no numérico suma 0 (scripts/rebuild_stats.py lo recalcula)
+    try:
+        return schema.to_number(value)
+    except ValueError:
+        return 0
+
+
+def _add_counters(tipo, delta):
+    """Parámetros de UpdateItem que suman ``delta`` a los contadores del tipo."""
+    return {
+        'Key': stats_key(tipo),
+        'UpdateExpression': 'ADD ' + ', '.join(f'#{name} :{name}' for name in COUNTERS),
+        'ExpressionAttributeNames': {'#' + name: name for name in COUNTERS},
+        'ExpressionAttributeValues': {':' + name: value for name, value in delta.items()},
+    }
+
+
+def counter_updates(removed=None, added=None):
+    """Acciones Update de los contadores al quitar el carro ``removed`` y agregar ``added``."""
+    by_tipo = {}
+    for car, sign in ((removed, -1), (added, 1)):
+        if car is None:
+            continue
+        delta = by_tipo.setdefault(car.get('tipo'), dict.fromkeys(COUNTERS, 0))
+        delta['count'] += sign
+        delta['sum_potencia'] += sign * number_or_zero(car.get('potencia'))
+        delta['sum_capacidad'] += sign * number_or_zero(car.get('capacidad'))
+
+    # Sin acción si el carro queda en el mismo tipo con los mismos valores
+    return [('Update', meta_table, _add_counters(tipo, delta)) for tipo, delta in by_tipo.items() if any(delta.values())]
+
+
+def register_tipos(tipos):
+    """Agrega los tipos a stats#tipos; cada contenedor lo hace una vez por tipo."""
+    new_tipos = {tipo for tipo in tipos if isinstance(tipo, str) and tipo and tipo not in _registered_tipos}
+    if not new_tipos:
+        return
+    try:
+        meta_table.update_item(
+            Key=TIPOS_KEY,
+            UpdateExpression='ADD tipos :tipos',
+            ExpressionAttributeValues={':tipos': new_tipos}
+        )
+    except ClientError as e:
+        logger.error("Could not register tipos %s: %s", sorted(new_tipos), e)
+        return
+    _registered_tipos.update(new_tipos)
+
+
+def registered_tipos():
+    return sorted(meta_table.get_item(Key=TIPOS_KEY).get('Item', {}).get('tipos', ()))
+
+
+def set_top_potencia(tipo, cars):
+    """Reemplaza la lista top_potencia del tipo sin tocar sus contadores."""
+    meta_table.update_item(
+        Key=stats_key(tipo),
+        UpdateExpression='SET top_potencia = :top',
+        ExpressionAttributeValues={':top': [{field: car.get(field) for field in TOP_FIELDS} for car in cars]}
+    )
+
+
+def read(tipos):
+    """Estadísticas de los tipos pedidos: {tipo: {'count', 'sum_potencia', 'sum_capacidad', 'top_potencia'}}."""
+    counters = {}
+    for item in meta_table.batch_get_all([stats_key(tipo) for tipo in tipos]):
+        tipo_stats = {name: item.get(name, 0) for name in COUNTERS}
+        tipo_stats['top_potencia'] = item.get('top_potencia', [])
+        counters[item['pk'][len(STATS_PREFIX):]] = tipo_stats
+    return counters
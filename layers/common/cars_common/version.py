@@ -0,0 +1,105 @@
+"""Contador de versión de los datos de carros y feed de cambios en CarsMetaTable.
+
+Cada escritura en CarsTable incrementa el contador con un ``ADD`` atómico. Los
+lectores que cachean respuestas leen la versión con una GetItem consistente
+antes de leer los datos: si no cambió, lo cacheado sigue siendo válido.
+
+El feed de cambios lo escribe el consumidor del stream de CarsTable
+(``car_views``): cada lote de registros se guarda como ``change#<posición>``
+con los carros que cambiaron, y ``feed#cars`` guarda la última posición. Los
+lectores con un índice propio (``search_cars``) aplican las entradas que les
+faltan en lugar de volver a leer la tabla; una entrada con ``rebuild`` les
+indica que deben reconstruirlo. Las entradas vencen por TTL (``expires_at``).
+"""
+import os
+import time
+import logging
+
+from botocore.exceptions import ClientError
+
+from cars_common.db import Table, client
+
+META_TABLE_NAME = os.environ.get('META_TABLE_NAME', 'CarsMetaTable')
+CARS_VERSION_KEY = {'pk': 'version#cars'}
+FEED_KEY = {'pk': 'feed#cars'}
+CHANGE_FEED_TTL_SECONDS = int(os.environ.get('CHANGE_FEED_TTL_SECONDS', str(24 * 3600)))
+# Por encima de este número de carros la entrada pide reconstruir (límite de 400 KB por elemento)
+CHANGE_FEED_MAX_CHANGES = int(os.environ.get('CHANGE_FEED_MAX_CHANGES', '500'))
+
+logger = logging.getLogger(__name__)
+
+meta_table = Table(META_TABLE_NAME, client)
+
+
+def current(meta=None):
+    """Versión actual (0 si todavía no hubo escrituras)."""
+    response = (meta or meta_table).get_item(Key=CARS_VERSION_KEY, ConsistentRead=True)
+    return response.get('Item', {}).get('v', 0)
+
+
+def bump(meta=None):
+    """Incrementa la versión tras una escritura y devuelve la nueva, o None si falla.
+
+    Un fallo aquí no debe convertir en error una escritura que ya se hizo: las
+    cachés quedan desactualizadas como mucho hasta que venza su TTL.
+    """
+    try:
+        response = (meta or meta_table).update_item(
+            Key=CARS_VERSION_KEY,
+            UpdateExpression='ADD v :one',
+            ExpressionAttributeValues={':one': 1},
+            ReturnValues='UPDATED_NEW'
+        )
+    except ClientError as e:
+        logger.error("Could not bump cars version: %s", e)
+        return None
+    return response['Attributes']['v']
+
+
+def change_key(position):
+    return {'pk': f'change#{position}'}
+
+
+def feed_position(meta=None):
+    """Posición de la última entrada del feed (0 si está vacío)."""
+    response = (meta or meta_table).get_item(Key=FEED_KEY, ConsistentRead=True)
+    return response.get('Item', {}).get('seq', 0)
+
+
+def append_changes(changes, meta=None):
+    """Agrega una entrada al feed y devuelve su posición.
+
+    ``changes`` son los carros escritos, ``{'id', 'nombre'}`` o ``{'id', 'deleted': True}``;
+    None si no se conocen. Si falla después de reservar la posición, los lectores ven
+    un hueco en el feed y acaban reconstruyendo su índice.
+    """
+    meta = meta or meta_table
+    response = meta.update_item(
+        Key=FEED_KEY,
+        UpdateExpression='ADD seq :one',
+        ExpressionAttributeValues={':one': 1},
+        ReturnValues='UPDATED_NEW'
+    )
+    position = response['Attributes']['seq']
+    entry = dict(change_key(position), expires_at=int(time.time()) + CHANGE_FEED_TTL_SECONDS)
+    if changes is None or len(changes) > CHANGE_FEED_MAX_CHANGES:
+        entry['rebuild'] = True
+    else:
+        entry['changes'] = list(changes)
+    meta.put_item(Item=entry)
+    return position
+
+
+def read_changes(since, until, meta=None):
+    """Entradas del feed de las posiciones ``since+1 .. until`` que ya existen, por posición.
+
+    Puede faltar alguna: su escritor aún no la guardó o no pudo hacerlo. Las
+    claves sin procesar se reintentan (``Table.batch_get_all``), así que una
+    posición ausente es una entrada que no existe y no una lectura con throttling;
+    RuntimeError si alguna sigue sin procesar.
+    """
+    keys = [change_key(position) for position in range(since + 1, until + 1)]
+    entries = {}
+    for item in (meta or meta_table).batch_get_all(keys, ConsistentRead=True):
+        entries[int(item['pk'].split('#', 1)[1])] = item
+    return entries
@@ -0,0 +1,31 @@
+import importlib
+
+# Todas las rutas usan el cliente compartido: se crea durante el init del contenedor
+import cars_common.db
+from cars_common import log, responses
+
+from routes import ROUTES
+
+# Logger JSON; el nivel sale de LOG_LEVEL
+logger = log.get_logger()
+
+
+def resolve(method, resource):
+    """Devuelve el lambda_handler de la ruta o None si no existe."""
+    module_name = ROUTES.get((method, resource))
+    if module_name is None:
+        return None
+    return importlib.import_module(module_name).lambda_handler
+
+
+def lambda_handler(event, context):
+    method = event.get('httpMethod')
+    resource = event.get('resource')
+    logger.debug("Routing %s %s", method, resource)
+
+    handler = resolve(method, resource)
+    if handler is None:
+        logger.warning("No route for %s %s", method, resource)
+        return responses.error(404, 'Route not found', f'{method} {resource}')
+
+    return handler(event, context)
@@ -0,0 +1,13 @@
+# (método, recurso de API Gateway) -> módulo con el lambda_handler que lo atiende.
+# Los módulos de los handlers se importan al primer uso: un contenedor que solo
+# recibe GET no paga la importación de los handlers de escritura.
+ROUTES = {
+    ('POST', '/car'): 'create_car',
+    ('POST', '/car/batch'): 'batch_create_car',
+    ('GET', '/car'): 'get_cars',
+    ('GET', '/car/search'): 'search_cars',
+    ('GET', '/car/stats'): 'car_stats',
+    ('GET', '/car/{id}'): 'get_car',
+    ('PUT', '/car/{id}'): 'update_car',
+    ('DELETE', '/car/{id}'): 'delete_car',
+}
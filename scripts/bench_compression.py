@@ -0,0 +1,100 @@
+"""Compara el costo de CPU y los bytes ahorrados al comprimir respuestas de GET /car.
+
+Genera listados sintéticos de carros, los serializa como get_cars y mide para
+cada codificación y nivel el tiempo de compresión + base64 y el tamaño que
+viaja por API Gateway. Lambda asigna CPU en proporción a la memoria (1 vCPU a
+1769 MB), así que el tiempo local se escala a la MemorySize de Globals en
+template.yaml para estimar el costo real en la función.
+
+Uso:
+    python scripts/bench_compression.py --cars 1000 5000 20000
+"""
+import argparse
+import base64
+import gzip
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT = Path(__file__).resolve().parent.parent
+FULL_VCPU_MEMORY_MB = 1769
+
+
+def template_memory_mb(template_path):
+    match = re.search(r'^\s+MemorySize:\s*(\d+)', Path(template_path).read_text(encoding='utf-8'), re.MULTILINE)
+    return int(match.group(1)) if match else 128
+
+
+def cars_body(count, seed=0):
+    rng = random.Random(seed)
+    cars = [
+        {
+            'id': f'{rng.getrandbits(128):032x}',
+            'nombre': f'Carro {i}',
+            'tipo': rng.choice(['SUV', 'Sedan', 'Pickup', 'Hatchback']),
+            'potencia': rng.randint(70, 600),
+            'capacidad': rng.randint(2, 8),
+        }
+        for i in range(count)
+    ]
+    return json.dumps({'items': cars, 'next': None})
+
+
+def encoders():
+    for level in (1, 5, 6, 9):
+        yield f'gzip-{level}', lambda raw, level=level: gzip.compress(raw, compresslevel=level, mtime=0)
+    if brotli is not None:
+        for quality in (1, 4, 6, 11):
+            yield f'br-{quality}', lambda raw, quality=quality: brotli.compress(raw, quality=quality)
+
+
+def best_seconds(function, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cars', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--memory-mb', type=int, help='por defecto la MemorySize de Globals en template.yaml')
+    parser.add_argument('--template', default=str(ROOT / 'template.yaml'))
+    args = parser.parse_args(argv)
+
+    memory_mb = args.memory_mb or template_memory_mb(args.template)
+    # Por debajo de 1769 MB la función recibe una fracción de vCPU
+    cpu_scale = max(1.0, FULL_VCPU_MEMORY_MB / memory_mb)
+    if brotli is None:
+        print('brotli not installed: only gzip is measured', file=sys.stderr)
+
+    print(f'Lambda estimate at {memory_mb} MB (local time x {cpu_scale:.1f})')
+    print(f"{'cars':>6}  {'encoding':<8}  {'raw KB':>8}  {'sent KB':>8}  {'saved':>6}  {'local ms':>8}  {'lambda ms':>9}")
+    for count in args.cars:
+        body = cars_body(count)
+        raw = body.encode('utf-8')
+        print(f"{count:>6}  {'identity':<8}  {len(raw) / 1024:>8.1f}  {len(raw) / 1024:>8.1f}  {0:>6.0%}  {0:>8.1f}  {0:>9.1f}")
+        for name, encode in encoders():
+            seconds, encoded = best_seconds(lambda: base64.b64encode(encode(body.encode('utf-8'))), args.repeat)
+            # API Gateway decodifica el base64: al cliente llegan los bytes comprimidos
+            sent = len(encoded) * 3 // 4
+            print(
+                f"{count:>6}  {name:<8}  {len(raw) / 1024:>8.1f}  {sent / 1024:>8.1f}  {1 - sent / len(raw):>6.0%}  "
+                f"{seconds * 1000:>8.1f}  {seconds * 1000 * cpu_scale:>9.1f}"
+            )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Compara el recurso de boto3 con cars_common.db en scans grandes.
+
+Alimenta la misma respuesta de Scan (carros sintéticos) a las dos rutas con
+``botocore.stub.Stubber``, así que se mide solo el trabajo en Python: la
+transformación del recurso (TypeDeserializer a Decimal) más ``decimal_to_float``
+y ``json.dumps`` que hacían los handlers, frente al deserializador propio más
+``json.dumps``.
+
+Uso:
+    python scripts/bench_deserializer.py --items 1000 10000 100000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def decimal_to_float(obj):
+    # Conversión que hacía get_cars antes de usar cars_common.db
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, dict):
+        return {k: decimal_to_float(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [decimal_to_float(i) for i in obj]
+    return obj
+
+
+def scan_response(count):
+    return {
+        'Items': [
+            {
+                'id': {'S': f'car-{i:08d}'},
+                'nombre': {'S': f'Carro {i}'},
+                'tipo': {'S': ('SUV', 'Sedan', 'Pickup')[i % 3]},
+                'potencia': {'N': str(90 + i % 400) + ('.5' if i % 2 else '')},
+                'capacidad': {'N': str(2 + i % 7)},
+            }
+            for i in range(count)
+        ],
+        'Count': count,
+        'ScannedCount': count,
+    }
+
+
+def bench(count, repeat):
+    import boto3
+    from botocore.stub import Stubber
+    from cars_common.db import Table
+
+    response = scan_response(count)
+
+    resource = boto3.resource('dynamodb')
+    resource_table = resource.Table('CarsTable')
+    resource_stubber = Stubber(resource.meta.client)
+
+    client = boto3.client('dynamodb')
+    lean_table = Table('CarsTable', client)
+    lean_stubber = Stubber(client)
+
+    def resource_path():
+        resource_stubber.add_response('scan', json.loads(json.dumps(response)))
+        with resource_stubber:
+            start = time.perf_counter()
+            items = resource_table.scan()['Items']
+            body = json.dumps(decimal_to_float(items))
+            return time.perf_counter() - start, body
+
+    def lean_path():
+        lean_stubber.add_response('scan', json.loads(json.dumps(response)))
+        with lean_stubber:
+            start = time.perf_counter()
+            items = lean_table.scan()['Items']
+            body = json.dumps(items)
+            return time.perf_counter() - start, body
+
+    # add_response valida la respuesta contra el modelo: se excluye de la medición
+    resource_s = min(resource_path()[0] for _ in range(repeat))
+    lean_s = min(lean_path()[0] for _ in range(repeat))
+    return resource_s, lean_s
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'bench')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'bench')
+    sys.path.insert(0, str(ROOT / 'layers' / 'common'))
+
+    print(f"{'items':>8}  {'resource ms':>12}  {'client ms':>10}  {'speedup':>7}")
+    for count in args.items:
+        resource_s, lean_s = bench(count, args.repeat)
+        print(f"{count:>8}  {resource_s * 1000:>12.1f}  {lean_s * 1000:>10.1f}  {resource_s / lean_s:>6.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
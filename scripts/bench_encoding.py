@@ -0,0 +1,101 @@
+"""Compara tiempo y memoria de serializar listados de carros a JSON.
+
+Variantes medidas sobre el mismo listado:
+
+* ``decimal_to_float``: el camino anterior de get_cars, con los números como
+  ``Decimal`` (recurso de boto3), una copia recursiva a float y ``json.dumps``.
+* ``json+default``: ``json.dumps`` sobre los ``Decimal`` con el hook ``default``
+  de cars_common.encoding, en una sola pasada.
+* ``orjson+default``: lo mismo con orjson (si está instalado).
+* ``encoding.dumps``: el camino actual, con los números ya como int/float
+  (cars_common.db) y cars_common.encoding.
+
+El pico de memoria se mide con tracemalloc en una corrida aparte, porque
+tracemalloc ralentiza la serialización.
+
+Uso:
+    python scripts/bench_encoding.py --items 1000 10000 100000
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def decimal_to_float(obj):
+    # Conversión que hacía get_cars antes de usar cars_common.db
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, dict):
+        return {k: decimal_to_float(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [decimal_to_float(i) for i in obj]
+    return obj
+
+
+def make_cars(count, number):
+    rng = random.Random(count)
+    return [
+        {
+            'id': f'{rng.getrandbits(128):032x}',
+            'nombre': f'Carro {i}',
+            'tipo': rng.choice(['SUV', 'Sedan', 'Pickup']),
+            'potencia': number(str(rng.randint(70, 600)) + ('.5' if i % 4 == 0 else '')),
+            'capacidad': number(str(rng.randint(2, 8))),
+        }
+        for i in range(count)
+    ]
+
+
+def native_number(text):
+    return float(text) if '.' in text else int(text)
+
+
+def variants():
+    from cars_common import encoding
+
+    yield 'decimal_to_float', Decimal, lambda cars: json.dumps({'items': decimal_to_float(cars)})
+    yield 'json+default', Decimal, lambda cars: json.dumps({'items': cars}, default=encoding._default)
+    if encoding.orjson is not None:
+        orjson = encoding.orjson
+        yield 'orjson+default', Decimal, lambda cars: orjson.dumps({'items': cars}, default=encoding._default).decode()
+    yield 'encoding.dumps', native_number, lambda cars: encoding.dumps({'items': cars})
+
+
+def measure(serialize, cars, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        serialize(cars)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    serialize(cars)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(ROOT / 'layers' / 'common'))
+
+    print(f"{'items':>7}  {'variant':<16}  {'ms':>8}  {'peak MB':>8}")
+    for count in args.items:
+        for name, number, serialize in variants():
+            seconds, peak = measure(serialize, make_cars(count, number), args.repeat)
+            print(f"{count:>7}  {name:<16}  {seconds * 1000:>8.1f}  {peak / 2 ** 20:>8.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Compara cold starts de DeploymentMode=split frente a router con un tráfico mixto.
+
+Reproduce una secuencia de peticiones (un JSONL con ``ts``, ``method``,
+``resource`` y opcionalmente ``duration_ms``, o un tráfico sintético con
+ráfagas) sobre un modelo simple de Lambda: cada función tiene su propio grupo de
+contenedores, una petición reutiliza un contenedor libre que no haya superado el
+tiempo de inactividad y, si no hay ninguno, provoca un cold start. En modo split
+cada ruta tiene su grupo; en modo router todas comparten el de CarsFunction.
+
+Uso:
+    python scripts/bench_router.py --minutes 60 --seed 1
+    python scripts/bench_router.py --replay trafico.jsonl --init-ms 400
+"""
+import argparse
+import json
+import random
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from package_report import iter_functions
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'router'))
+
+from routes import ROUTES
+
+# Proporción de cada ruta y duración típica (ms) en el tráfico sintético
+MIX = {
+    ('GET', '/car'): (0.40, 120),
+    ('GET', '/car/{id}'): (0.30, 25),
+    ('POST', '/car'): (0.12, 30),
+    ('PUT', '/car/{id}'): (0.10, 30),
+    ('DELETE', '/car/{id}'): (0.06, 25),
+    ('POST', '/car/batch'): (0.02, 400),
+}
+
+
+def synthetic_requests(minutes, rps, burst_rps, burst_every, burst_seconds, seed):
+    """Tráfico de Poisson con ráfagas periódicas; devuelve (ts, método, recurso, ms) ordenados."""
+    rng = random.Random(seed)
+    routes = list(MIX)
+    weights = [MIX[route][0] for route in routes]
+    requests = []
+    t = 0.0
+    end = minutes * 60
+    while t < end:
+        in_burst = burst_every and (t % burst_every) < burst_seconds
+        t += rng.expovariate(burst_rps if in_burst else rps)
+        if t >= end:
+            break
+        method, resource = rng.choices(routes, weights)[0]
+        duration_ms = rng.expovariate(1 / MIX[(method, resource)][1])
+        requests.append((t, method, resource, duration_ms))
+    return requests
+
+
+def replay_requests(path):
+    requests = []
+    with open(path, encoding='utf-8') as replay:
+        for line in replay:
+            if line.strip():
+                record = json.loads(line)
+                duration_ms = record.get('duration_ms', MIX.get((record['method'], record['resource']), (0, 50))[1])
+                requests.append((float(record['ts']), record['method'], record['resource'], float(duration_ms)))
+    requests.sort()
+    start = requests[0][0] if requests else 0.0
+    return [(ts - start, method, resource, duration_ms) for ts, method, resource, duration_ms in requests]
+
+
+class Pool:
+    """Contenedores de una función: [ocupado_hasta, último_uso] en segundos."""
+
+    def __init__(self, idle_seconds, init_seconds):
+        self.idle_seconds = idle_seconds
+        self.init_seconds = init_seconds
+        self.containers = []
+        self.cold_starts = 0
+        self.peak = 0
+
+    def invoke(self, t, duration_seconds):
+        self.containers = [c for c in self.containers if c[0] > t or t - c[1] <= self.idle_seconds]
+        free = [c for c in self.containers if c[0] <= t]
+        if free:
+            container = max(free, key=lambda c: c[1])
+            cold = False
+        else:
+            container = [t, t]
+            self.containers.append(container)
+            self.cold_starts += 1
+            cold = True
+        busy = duration_seconds + (self.init_seconds if cold else 0.0)
+        container[0] = t + busy
+        container[1] = t + busy
+        self.peak = max(self.peak, len(self.containers))
+        return cold
+
+
+def simulate(requests, pool_of, idle_seconds, init_seconds):
+    pools = defaultdict(lambda: Pool(idle_seconds, init_seconds))
+    for t, method, resource, duration_ms in requests:
+        name = pool_of(method, resource)
+        if name is not None:
+            pools[name].invoke(t, duration_ms / 1000)
+    return pools
+
+
+def summary(label, pools, total, init_ms):
+    cold = sum(pool.cold_starts for pool in pools.values())
+    print(f'{label}: {cold} cold starts ({cold / total:.2%} of {total} requests), '
+          f'{cold * init_ms / 1000:.1f} s of init, peak containers {sum(p.peak for p in pools.values())}')
+    for name, pool in sorted(pools.items()):
+        print(f'    {name:<26} cold {pool.cold_starts:>5}  peak {pool.peak:>3}')
+    return cold
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--replay', help='JSONL con ts (epoch s), method, resource y duration_ms opcional')
+    parser.add_argument('--template', default=str(ROOT / 'template.yaml'))
+    parser.add_argument('--minutes', type=float, default=60)
+    parser.add_argument('--rps', type=float, default=0.5, help='peticiones por segundo fuera de ráfagas')
+    parser.add_argument('--burst-rps', type=float, default=20)
+    parser.add_argument('--burst-every', type=float, default=900, help='segundos entre ráfagas (0 sin ráfagas)')
+    parser.add_argument('--burst-seconds', type=float, default=30)
+    parser.add_argument('--idle-seconds', type=float, default=420, help='inactividad tras la que Lambda recicla un contenedor')
+    parser.add_argument('--init-ms', type=float, default=400, help='duración de un cold start (ver coldstart_profile.py)')
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        requests = replay_requests(args.replay)
+    else:
+        requests = synthetic_requests(
+            args.minutes, args.rps, args.burst_rps, args.burst_every, args.burst_seconds, args.seed
+        )
+    if not requests:
+        print('No requests to replay', file=sys.stderr)
+        return 1
+
+    # En modo split cada módulo de handler es una función distinta del template
+    function_of_module = {module: resource for resource, module, _ in iter_functions(args.template)}
+
+    def split_pool(method, resource):
+        module = ROUTES.get((method, resource))
+        return function_of_module.get(module, module)
+
+    def router_pool(method, resource):
+        return 'CarsFunction' if (method, resource) in ROUTES else None
+
+    init_seconds = args.init_ms / 1000
+    split_cold = summary('split', simulate(requests, split_pool, args.idle_seconds, init_seconds),
+                         len(requests), args.init_ms)
+    router_cold = summary('router', simulate(requests, router_pool, args.idle_seconds, init_seconds),
+                          len(requests), args.init_ms)
+    if router_cold:
+        print(f'split/router cold starts: {split_cold / router_cold:.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""Perfila el cold start de cada handler y falla si supera el presupuesto.
+
+Importa el módulo de cada handler en un intérprete nuevo con ``-X importtime``
+y registra la duración del init (import + creación de recursos a nivel de
+módulo), el pico de RSS y el desglose del tiempo de importación por paquete.
+Devuelve código de salida 1 si alguna función supera su presupuesto, para
+detectar regresiones de cold start en local o en CI.
+
+Por defecto mide el código fuente (CodeUri de cada función más layers/common);
+las dependencias salen del intérprete actual o de ``--deps``. Con ``--build-dir``
+mide los artefactos de ``sam build``. En el desglose, la fila del propio módulo
+del handler incluye el trabajo a nivel de módulo (p. ej. ``boto3.resource()``).
+
+Uso:
+    python scripts/coldstart_profile.py --deps .aws-sam/build/CommonLayer/python
+    python scripts/coldstart_profile.py --build-dir .aws-sam/build --budget-ms 300
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from package_report import LAYER_NAME, iter_functions
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET_FILE = Path(__file__).resolve().parent / 'coldstart_budget.json'
+# CarsFunction (CodeUri: .) se construye con el Makefile raíz: router + todos los handlers
+ROUTER_SOURCE_DIRS = ['router', 'create_car', 'get_cars', 'update_car', 'delete_car']
+
+INIT_PROBE = (
+    "import json, resource, sys, time\n"
+    "start = time.perf_counter()\n"
+    "__import__(sys.argv[1])\n"
+    "init_ms = (time.perf_counter() - start) * 1000\n"
+    "rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+    "print(json.dumps({'init_ms': init_ms, 'rss_mb': rss_kb / 1024}))\n"
+)
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|\s+(\S+)')
+
+
+def package_breakdown(importtime_output):
+    """Suma el tiempo propio (self) de cada import agrupado por paquete de primer nivel."""
+    totals = defaultdict(int)
+    for line in importtime_output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            totals[match.group(3).split('.')[0]] += int(match.group(1))
+    return {package: us / 1000 for package, us in sorted(totals.items(), key=lambda item: -item[1])}
+
+
+def profile(module, python_path, cwd):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(str(p) for p in python_path), PYTHONDONTWRITEBYTECODE='1')
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', INIT_PROBE, module],
+        env=env, cwd=cwd, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'import of {module} failed:\n{result.stderr[-2000:]}')
+    measurement = json.loads(result.stdout.strip().splitlines()[-1])
+    measurement['packages'] = package_breakdown(result.stderr)
+    return measurement
+
+
+def best_of(module, python_path, cwd, repeat):
+    runs = [profile(module, python_path, cwd) for _ in range(repeat)]
+    return min(runs, key=lambda run: run['init_ms'])
+
+
+def load_budget(path, budget_ms=None, budget_rss_mb=None):
+    budget = {'default': {'init_ms': 500, 'rss_mb': 100}, 'functions': {}}
+    if path and Path(path).is_file():
+        budget.update(json.loads(Path(path).read_text(encoding='utf-8')))
+    if budget_ms is not None:
+        budget['default']['init_ms'] = budget_ms
+    if budget_rss_mb is not None:
+        budget['default']['rss_mb'] = budget_rss_mb
+    return budget
+
+
+def budget_for(budget, resource):
+    limits = dict(budget['default'])
+    limits.update(budget['functions'].get(resource, {}))
+    return limits
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--template', default=str(ROOT / 'template.yaml'))
+    parser.add_argument('--build-dir', help='mide los artefactos de sam build en lugar del código fuente')
+    parser.add_argument('--deps', action='append', default=[], help='directorio extra con dependencias (boto3)')
+    parser.add_argument('--budget-file', default=str(DEFAULT_BUDGET_FILE))
+    parser.add_argument('--budget-ms', type=float, help='presupuesto de init por defecto en ms')
+    parser.add_argument('--budget-rss-mb', type=float, help='presupuesto de RSS por defecto en MB')
+    parser.add_argument('--repeat', type=int, default=3, help='corridas por función (se toma la más rápida)')
+    parser.add_argument('--top', type=int, default=5, help='paquetes a mostrar en el desglose')
+    parser.add_argument('--function', action='append', help='limita el perfil a estas funciones')
+    parser.add_argument('--json', action='store_true', help='imprime los resultados como JSON')
+    args = parser.parse_args(argv)
+
+    budget = load_budget(args.budget_file, args.budget_ms, args.budget_rss_mb)
+    results = {}
+    failures = []
+    for resource, module, code_uri in iter_functions(args.template):
+        if args.function and resource not in args.function:
+            continue
+        if args.build_dir:
+            function_dir = Path(args.build_dir) / resource
+            python_path = [function_dir, Path(args.build_dir) / LAYER_NAME / 'python']
+        elif code_uri == '.':
+            function_dir = ROOT / 'router'
+            python_path = [ROOT / d for d in ROUTER_SOURCE_DIRS] + [ROOT / 'layers' / 'common']
+        else:
+            function_dir = ROOT / code_uri
+            python_path = [function_dir, ROOT / 'layers' / 'common']
+        python_path += [Path(deps) for deps in args.deps]
+
+        measurement = best_of(module, python_path, function_dir, args.repeat)
+        limits = budget_for(budget, resource)
+        measurement['budget'] = limits
+        results[resource] = measurement
+        if measurement['init_ms'] > limits['init_ms'] or measurement['rss_mb'] > limits['rss_mb']:
+            failures.append(resource)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for resource, measurement in results.items():
+            limits = measurement['budget']
+            status = 'OVER BUDGET' if resource in failures else 'ok'
+            print(
+                f"{resource}: init {measurement['init_ms']:.0f} ms (budget {limits['init_ms']:.0f}), "
+                f"peak RSS {measurement['rss_mb']:.1f} MB (budget {limits['rss_mb']:.0f}) [{status}]"
+            )
+            for package, ms in list(measurement['packages'].items())[:args.top]:
+                print(f"    {package:<20} {ms:8.1f} ms")
+
+    if failures:
+        print(f"Cold-start budget exceeded by: {', '.join(failures)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Exporta CarsTable completa como NDJSON (un carro por línea), opcionalmente en gzip.
+
+Recorre la tabla con un scan paralelo y escribe cada página en cuanto llega,
+así que la memoria se mantiene constante sin importar el tamaño de la tabla.
+
+Uso:
+    python scripts/export_cars.py > cars.jsonl
+    python scripts/export_cars.py --gzip -o cars.jsonl.gz --segments 8
+    python scripts/export_cars.py --endpoint-url http://localhost:8000
+    python scripts/export_cars.py --fake --fake-items 10000 | head
+"""
+import argparse
+import gzip
+import io
+import json
+import logging
+import os
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _json_number(value):
+    # cars_common.db devuelve los números fraccionarios como Decimal
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def export_ndjson(pages, output):
+    """Escribe cada carro de las páginas como una línea JSON; devuelve cuántos escribió."""
+    count = 0
+    for page in pages:
+        output.write(''.join(json.dumps(item, default=_json_number) + '\n' for item in page))
+        count += len(page)
+    return count
+
+
+def open_output(path, use_gzip):
+    if path == '-':
+        raw = gzip.GzipFile(fileobj=sys.stdout.buffer, mode='wb') if use_gzip else sys.stdout.buffer
+    else:
+        raw = gzip.open(path, 'wb') if use_gzip else open(path, 'wb')
+    return io.TextIOWrapper(raw, encoding='utf-8')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-o', '--output', default='-', help="archivo de salida ('-' para stdout)")
+    parser.add_argument('--gzip', action='store_true', help='comprime la salida con gzip')
+    parser.add_argument('--segments', type=int, help='TotalSegments; por defecto según el tamaño de la tabla')
+    parser.add_argument('--table', default=os.environ.get('TABLE_NAME', 'CarsTable'))
+    parser.add_argument('--region', default=os.environ.get('AWS_DEFAULT_REGION', 'us-east-1'))
+    parser.add_argument('--endpoint-url', help='por ejemplo http://localhost:8000 para DynamoDB Local')
+    parser.add_argument('--fake', action='store_true', help='lee de un DynamoDB falso en memoria')
+    parser.add_argument('--fake-items', type=int, default=1000, help='carros generados en el DynamoDB falso')
+    args = parser.parse_args(argv)
+
+    # get_cars crea su cliente de DynamoDB al importarse y necesita una región
+    os.environ.setdefault('AWS_DEFAULT_REGION', args.region)
+    # Los handlers fijan el nivel del logger raíz (LOG_LEVEL) al importarse; el filtro va en el handler
+    handler = logging.StreamHandler()
+    handler.setLevel(logging.WARNING)
+    logging.basicConfig(handlers=[handler])
+    sys.path[:0] = [str(ROOT / 'get_cars'), str(ROOT / 'layers' / 'common')]
+    from cars_common.db import Table, iter_scan_pages, make_client
+    from get_cars import scan_segments_for
+
+    if args.fake:
+        from fake_dynamodb import FakeDynamoDB
+        fake = FakeDynamoDB()
+        fake.tables[args.table] = {
+            f'car-{i:08d}': {'id': f'car-{i:08d}', 'nombre': f'Carro {i}', 'tipo': 'SUV',
+                             'potencia': 100 + i % 300, 'capacidad': 5}
+            for i in range(args.fake_items)
+        }
+        table = fake.Table(args.table)
+    else:
+        # Una conexión por segmento; sin --segments basta el pool por defecto
+        pool = {'max_pool_connections': args.segments} if args.segments else {}
+        table = Table(args.table, make_client(endpoint_url=args.endpoint_url, region_name=args.region, **pool))
+
+    total_segments = args.segments
+    if total_segments is None:
+        size_bytes = table.describe()['TableSizeBytes']
+        # Sin límite de tiempo de Lambda: solo cuenta el tamaño de la tabla
+        total_segments = scan_segments_for(size_bytes, remaining_ms=float('inf'))
+
+    started = time.monotonic()
+    with open_output(args.output, args.gzip) as output:
+        count = export_ndjson(iter_scan_pages(table, total_segments), output)
+    print(f"Exported {count} cars with {total_segments} segments in {time.monotonic() - started:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Fake en memoria del cliente de DynamoDB para probar los scripts sin AWS.
+
+Implementa solo las operaciones que usan los scripts, con la misma forma de
+petición/respuesta que el cliente de alto nivel de boto3 (tipos nativos de
+Python). ``Table()`` devuelve un objeto con la interfaz de ``cars_common.db.Table``.
+``unprocessed_rate`` devuelve una fracción de las escrituras como
+UnprocessedItems para ejercitar los reintentos.
+"""
+import random
+import threading
+import zlib
+
+
+class FakeDynamoDB:
+    def __init__(self, unprocessed_rate=0.0, seed=None):
+        self.tables = {}
+        self.unprocessed_rate = unprocessed_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _table(self, name):
+        return self.tables.setdefault(name, {})
+
+    def _metadata(self):
+        return {'ResponseMetadata': {'HTTPStatusCode': 200, 'RetryAttempts': 0}}
+
+    def batch_write_item(self, RequestItems):
+        unprocessed = {}
+        with self._lock:
+            for table_name, requests in RequestItems.items():
+                if len(requests) > 25:
+                    raise ValueError('BatchWriteItem accepts at most 25 requests')
+                table = self._table(table_name)
+                for request in requests:
+                    if self._random.random() < self.unprocessed_rate:
+                        unprocessed.setdefault(table_name, []).append(request)
+                    elif 'PutRequest' in request:
+                        item = request['PutRequest']['Item']
+                        table[item['id']] = dict(item)
+                    else:
+                        table.pop(request['DeleteRequest']['Key']['id'], None)
+        response = self._metadata()
+        response['UnprocessedItems'] = unprocessed
+        return response
+
+    def scan(self, TableName, Segment=0, TotalSegments=1, Limit=1000, ExclusiveStartKey=None, **kwargs):
+        with self._lock:
+            ids = sorted(
+                car_id for car_id in self._table(TableName)
+                if zlib.crc32(car_id.encode('utf-8')) % TotalSegments == Segment
+            )
+            if ExclusiveStartKey is not None:
+                ids = [car_id for car_id in ids if car_id > ExclusiveStartKey['id']]
+            page = ids[:Limit]
+            items = [dict(self._table(TableName)[car_id]) for car_id in page]
+        response = self._metadata()
+        response.update(Items=items, Count=len(items), ScannedCount=len(items))
+        if len(ids) > Limit:
+            response['LastEvaluatedKey'] = {'id': page[-1]}
+        return response
+
+    def describe_table(self, TableName):
+        with self._lock:
+            item_count = len(self._table(TableName))
+        response = self._metadata()
+        response['Table'] = {'TableName': TableName, 'ItemCount': item_count, 'TableSizeBytes': item_count * 100}
+        return response
+
+    def Table(self, name):
+        return FakeTable(self, name)
+
+
+class FakeTable:
+    def __init__(self, dynamodb, name):
+        self.name = name
+        self._dynamodb = dynamodb
+
+    def scan(self, **kwargs):
+        return self._dynamodb.scan(TableName=self.name, **kwargs)
+
+    def describe(self):
+        return self._dynamodb.describe_table(TableName=self.name)['Table']
@@ -0,0 +1,200 @@
+"""Importa carros a CarsTable desde un archivo JSONL o CSV.
+
+Lee el archivo línea por línea (nunca lo carga completo en memoria), valida
+cada registro con las mismas reglas que POST /car y escribe en bloques de 25
+con un pool de workers concurrentes de BatchWriteItem.
+
+Uso:
+    python scripts/import_cars.py cars.jsonl
+    python scripts/import_cars.py cars.csv --endpoint-url http://localhost:8000
+    python scripts/import_cars.py cars.jsonl --fake --fake-unprocessed-rate 0.1
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+BATCH_WRITE_SIZE = 25
+THROTTLING_ERRORS = ('ProvisionedThroughputExceededException', 'ThrottlingException', 'RequestLimitExceeded')
+
+
+class ImportStats:
+    def __init__(self):
+        self.read = 0
+        self.invalid = 0
+        self.written = 0
+        self.failed = 0
+        self.retries = 0
+        self.throttles = 0
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, **counters):
+        with self._lock:
+            for name, value in counters.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def report(self):
+        elapsed = time.monotonic() - self.started
+        return (
+            f"read={self.read} written={self.written} invalid={self.invalid} failed={self.failed} "
+            f"retries={self.retries} throttles={self.throttles} "
+            f"elapsed={elapsed:.1f}s throughput={self.written / elapsed if elapsed else 0:.0f} items/s"
+        )
+
+
+def read_records(path, file_format):
+    """Genera (registro, error) por cada línea sin cargar el archivo completo en memoria."""
+    with open(path, newline='', encoding='utf-8') as f:
+        if file_format == 'csv':
+            for record in csv.DictReader(f):
+                yield record, None
+            return
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line, parse_float=Decimal), None
+            except json.JSONDecodeError as e:
+                yield None, f'Invalid JSON line: {e}'
+
+
+def write_chunk(client, table_name, cars, stats, max_retries, base_delay=0.05):
+    from botocore.exceptions import ClientError
+
+    request_items = {table_name: [{'PutRequest': {'Item': car}} for car in cars]}
+    for attempt in range(max_retries + 1):
+        try:
+            response = client.batch_write_item(RequestItems=request_items)
+        except ClientError as e:
+            if e.response['Error']['Code'] not in THROTTLING_ERRORS:
+                raise
+            # botocore ya agotó sus propios reintentos: se reintenta el bloque completo
+            stats.add(throttles=1)
+        else:
+            # Reintentos internos de botocore por throttling
+            stats.add(throttles=response['ResponseMetadata'].get('RetryAttempts', 0))
+            request_items = response.get('UnprocessedItems')
+            if not request_items:
+                stats.add(written=len(cars))
+                return
+            unprocessed = len(request_items[table_name])
+            stats.add(written=len(cars) - unprocessed)
+            cars = [request['PutRequest']['Item'] for request in request_items[table_name]]
+        if attempt < max_retries:
+            stats.add(retries=1)
+            time.sleep(random.uniform(0, base_delay * 2 ** attempt))
+    stats.add(failed=len(cars))
+    print(f"Gave up on {len(cars)} items after {max_retries} retries", file=sys.stderr)
+
+
+def run_import(records, client, table_name, build_car, workers=4, max_retries=8, report_every=5.0):
+    """Valida y escribe los registros; devuelve las estadísticas de la importación."""
+    stats = ImportStats()
+    # Limita los bloques en vuelo para que la memoria no crezca con el archivo
+    in_flight = threading.BoundedSemaphore(workers * 2)
+    last_report = time.monotonic()
+
+    def submit(executor, chunk):
+        in_flight.acquire()
+        future = executor.submit(write_chunk, client, table_name, chunk, stats, max_retries)
+        future.add_done_callback(lambda _: in_flight.release())
+        return future
+
+    pending = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        chunk = []
+        for line_number, (record, error) in enumerate(records, start=1):
+            stats.add(read=1)
+            if error is None:
+                try:
+                    chunk.append(build_car(record))
+                except (KeyError, TypeError) as e:
+                    error = f'Missing required fields: {e}'
+                except ValueError as e:
+                    error = f'Invalid field value: {e}'
+            if error is not None:
+                stats.add(invalid=1)
+                print(f"Record {line_number}: {error}", file=sys.stderr)
+
+            if len(chunk) == BATCH_WRITE_SIZE:
+                pending.append(submit(executor, chunk))
+                chunk = []
+                # Descarta los bloques terminados; result() propaga cualquier error de escritura
+                still_pending = []
+                for future in pending:
+                    if future.done():
+                        future.result()
+                    else:
+                        still_pending.append(future)
+                pending = still_pending
+
+            if time.monotonic() - last_report >= report_every:
+                print(stats.report(), file=sys.stderr)
+                last_report = time.monotonic()
+        if chunk:
+            pending.append(submit(executor, chunk))
+        for future in pending:
+            future.result()
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path', help='archivo .jsonl o .csv')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], help='por defecto se deduce de la extensión')
+    parser.add_argument('--table', default=os.environ.get('TABLE_NAME', 'CarsTable'))
+    parser.add_argument('--region', default=os.environ.get('AWS_DEFAULT_REGION', 'us-east-1'))
+    parser.add_argument('--endpoint-url', help='por ejemplo http://localhost:8000 para DynamoDB Local')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--max-retries', type=int, default=8)
+    parser.add_argument('--report-every', type=float, default=5.0, help='segundos entre reportes de progreso')
+    parser.add_argument('--fake', action='store_true', help='escribe en un DynamoDB falso en memoria')
+    parser.add_argument('--fake-unprocessed-rate', type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    file_format = args.format or ('csv' if args.path.lower().endswith('.csv') else 'jsonl')
+
+    # create_car crea su cliente de DynamoDB al importarse y necesita una región
+    os.environ.setdefault('AWS_DEFAULT_REGION', args.region)
+    # Los handlers fijan el nivel del logger raíz (LOG_LEVEL) al importarse; el filtro va en el handler
+    handler = logging.StreamHandler()
+    handler.setLevel(logging.WARNING)
+    logging.basicConfig(handlers=[handler])
+    sys.path[:0] = [str(ROOT / 'create_car'), str(ROOT / 'layers' / 'common')]
+    from create_car import build_car
+
+    if args.fake:
+        from fake_dynamodb import FakeDynamoDB
+        client = FakeDynamoDB(unprocessed_rate=args.fake_unprocessed_rate)
+    else:
+        import boto3
+        # El cliente del recurso acepta y devuelve tipos nativos de Python
+        client = boto3.resource('dynamodb', region_name=args.region, endpoint_url=args.endpoint_url).meta.client
+
+    stats = run_import(
+        read_records(args.path, file_format), client, args.table, build_car,
+        workers=args.workers, max_retries=args.max_retries, report_every=args.report_every
+    )
+    if stats.written and not args.fake:
+        # Invalida las respuestas de GET /car cacheadas en los contenedores calientes
+        from cars_common import version
+        from cars_common.db import Table, make_client
+        meta = Table(version.META_TABLE_NAME, make_client(endpoint_url=args.endpoint_url, region_name=args.region))
+        version.bump(meta)
+    print(stats.report(), file=sys.stderr)
+    return 1 if stats.failed or stats.invalid else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Convierte a número los campos potencia y capacidad guardados como texto en CarsTable.
+
+Los carros creados antes de que POST/PUT /car normalizaran estos campos pueden
+tenerlos como texto ("150"); los índices TipoPotenciaIndex y
+TipoCapacidadIndex solo contienen los guardados como número, y DynamoDB
+rechaza escribir texto en un atributo que es clave de un índice. Conviene
+correr el script antes de agregar los índices (y otra vez después, por las
+escrituras que hayan llegado mientras tanto).
+
+Cada actualización es condicional al valor leído, así que no pisa una
+escritura concurrente. Los valores que no son números se reportan y quedan
+como están.
+
+Uso:
+    python scripts/normalize_numbers.py --dry-run
+    python scripts/normalize_numbers.py --segments 4 --endpoint-url http://localhost:8000
+"""
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Solo se leen los carros con algún campo numérico guardado como texto
+TEXT_NUMBERS_FILTER = {
+    'FilterExpression': 'attribute_type(#potencia, :text) OR attribute_type(#capacidad, :text)',
+    'ExpressionAttributeNames': {'#potencia': 'potencia', '#capacidad': 'capacidad'},
+    'ExpressionAttributeValues': {':text': 'S'},
+}
+
+
+def normalize_item(table, item, schema, dry_run=False):
+    """Actualiza los campos numéricos de un carro; devuelve (actualizado, errores)."""
+    from botocore.exceptions import ClientError
+
+    names = {}
+    values = {}
+    sets = []
+    conditions = []
+    errors = []
+    for field in schema.NUMERIC_FIELDS:
+        value = item.get(field)
+        if not isinstance(value, str):
+            continue
+        try:
+            number = schema.to_number(value)
+        except ValueError:
+            errors.append(f'{field}={value!r}')
+            continue
+        names['#' + field] = field
+        values[':new_' + field] = number
+        values[':old_' + field] = value
+        sets.append(f'#{field} = :new_{field}')
+        conditions.append(f'#{field} = :old_{field}')
+    if not sets or dry_run:
+        return bool(sets), errors
+
+    try:
+        table.update_item(
+            Key={'id': item['id']},
+            UpdateExpression='SET ' + ', '.join(sets),
+            ConditionExpression=' AND '.join(conditions),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        # Cambió o se borró después del scan: la escritura nueva ya pasó por la normalización
+        return False, errors
+    return True, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--segments', type=int, default=1, help='TotalSegments del scan')
+    parser.add_argument('--dry-run', action='store_true', help='solo cuenta lo que se convertiría')
+    parser.add_argument('--table', default=os.environ.get('TABLE_NAME', 'CarsTable'))
+    parser.add_argument('--region', default=os.environ.get('AWS_DEFAULT_REGION', 'us-east-1'))
+    parser.add_argument('--endpoint-url', help='por ejemplo http://localhost:8000 para DynamoDB Local')
+    args = parser.parse_args(argv)
+
+    # cars_common.db crea su cliente al importarse y necesita una región
+    os.environ.setdefault('AWS_DEFAULT_REGION', args.region)
+    handler = logging.StreamHandler()
+    handler.setLevel(logging.WARNING)
+    logging.basicConfig(handlers=[handler])
+    sys.path[:0] = [str(ROOT / 'layers' / 'common')]
+    from cars_common import schema, version
+    from cars_common.db import Table, iter_scan_pages, make_client
+
+    client = make_client(endpoint_url=args.endpoint_url, region_name=args.region, max_pool_connections=args.segments)
+    table = Table(args.table, client)
+
+    updated = invalid = 0
+    for page in iter_scan_pages(table, args.segments, scan_kwargs=TEXT_NUMBERS_FILTER):
+        for item in page:
+            changed, errors = normalize_item(table, item, schema, dry_run=args.dry_run)
+            updated += changed
+            if errors:
+                invalid += 1
+                print(f"Car {item['id']}: not a number: {', '.join(errors)}", file=sys.stderr)
+
+    if updated and not args.dry_run:
+        # Invalida las respuestas de GET /car cacheadas en los contenedores calientes
+        version.bump(Table(version.META_TABLE_NAME, client))
+    verb = 'Would convert' if args.dry_run else 'Converted'
+    print(f"{verb} {updated} cars; {invalid} cars with non-numeric values", file=sys.stderr)
+    return 1 if invalid else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""Reporta el tamaño del paquete y el tiempo de importación de cada función.
+
+Lee las funciones y sus handlers de template.yaml y mide cada una sobre un
+directorio de build de SAM (por defecto .aws-sam/build): archivos, bytes sin
+comprimir, bytes del zip y tiempo de importar el módulo del handler en un
+intérprete nuevo (con la capa compartida en el path, como en Lambda).
+
+Uso:
+    sam build && python scripts/package_report.py
+    python scripts/package_report.py --baseline /tmp/build-antes
+"""
+import argparse
+import io
+import os
+import re
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+LAYER_NAME = 'CommonLayer'
+
+IMPORT_TIMER = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "__import__(sys.argv[1])\n"
+    "print(time.perf_counter() - start)\n"
+)
+
+
+def iter_functions(template_path):
+    """Genera (recurso, módulo del handler, CodeUri) para cada AWS::Serverless::Function."""
+    resource = code_uri = None
+    for line in Path(template_path).read_text(encoding='utf-8').splitlines():
+        match = re.match(r'^  (\w+):\s*$', line)
+        if match:
+            resource, code_uri = match.group(1), None
+            continue
+        match = re.match(r'^\s+CodeUri:\s*(\S+)', line)
+        if match:
+            code_uri = match.group(1)
+            continue
+        match = re.match(r'^\s+Handler:\s*(\S+)', line)
+        if match and resource:
+            yield resource, match.group(1).rsplit('.', 1)[0], code_uri
+
+
+def package_size(path):
+    """Devuelve (archivos, bytes, bytes comprimidos en zip) de un directorio."""
+    files = [p for p in Path(path).rglob('*') if p.is_file()]
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for file_path in files:
+            archive.write(file_path, file_path.relative_to(path))
+    return len(files), sum(p.stat().st_size for p in files), buffer.tell()
+
+
+def import_seconds(function_dir, module, layer_dir, repeat=3):
+    """Mejor tiempo de importar el handler en un intérprete nuevo, como en un cold start."""
+    python_path = [str(function_dir)]
+    if layer_dir and Path(layer_dir).is_dir():
+        python_path.append(str(layer_dir))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(python_path), PYTHONDONTWRITEBYTECODE='1')
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-c', IMPORT_TIMER, module],
+            env=env, cwd=function_dir, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return None
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return min(timings)
+
+
+def measure(build_dir, template_path, repeat=3):
+    layer_dir = Path(build_dir) / LAYER_NAME / 'python'
+    rows = {}
+    for resource, module, _ in iter_functions(template_path):
+        function_dir = Path(build_dir) / resource
+        if not function_dir.is_dir():
+            continue
+        files, size, zipped = package_size(function_dir)
+        rows[resource] = {
+            'files': files,
+            'bytes': size,
+            'zip_bytes': zipped,
+            'import_s': import_seconds(function_dir, module, layer_dir, repeat),
+        }
+    if layer_dir.is_dir():
+        files, size, zipped = package_size(layer_dir.parent)
+        rows[LAYER_NAME] = {'files': files, 'bytes': size, 'zip_bytes': zipped, 'import_s': None}
+    return rows
+
+
+def _format_row(name, row, baseline=None):
+    def kb(value):
+        return f'{value / 1024:,.1f}'
+
+    cells = [name, str(row['files']), kb(row['bytes']), kb(row['zip_bytes'])]
+    cells.append('-' if row['import_s'] is None else f"{row['import_s'] * 1000:.0f}")
+    if baseline:
+        cells.append(f"{kb(baseline['zip_bytes'])} -> {kb(row['zip_bytes'])}")
+        if row['import_s'] is not None and baseline['import_s'] is not None:
+            cells.append(f"{baseline['import_s'] * 1000:.0f} -> {row['import_s'] * 1000:.0f}")
+    return cells
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--build-dir', default=str(ROOT / '.aws-sam' / 'build'))
+    parser.add_argument('--baseline', help='otro directorio de build con el que comparar (antes)')
+    parser.add_argument('--template', default=str(ROOT / 'template.yaml'))
+    parser.add_argument('--repeat', type=int, default=3, help='importaciones por función (se toma la mejor)')
+    args = parser.parse_args(argv)
+
+    rows = measure(args.build_dir, args.template, args.repeat)
+    baseline = measure(args.baseline, args.template, args.repeat) if args.baseline else {}
+
+    header = ['package', 'files', 'KB', 'zip KB', 'import ms']
+    if baseline:
+        header += ['zip KB before -> after', 'import ms before -> after']
+    table = [header] + [_format_row(name, row, baseline.get(name)) for name, row in rows.items()]
+    widths = [max(len(row[i]) for row in table if i < len(row)) for i in range(len(header))]
+    for row in table:
+        print('  '.join(cell.ljust(width) for cell, width in zip(row, widths)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Recalcula los contadores de GET /car/stats (stats#<tipo>) a partir de CarsTable.
+
+El consumidor del stream (car_views) mantiene los contadores con cada
+escritura; hace falta recalcularlos al activarlo sobre una tabla con datos
+(el stream solo trae las escrituras posteriores) y si descartó registros
+(van a CarViewsFailureQueue).
+
+Sobrescribe los contadores con lo leído en el scan: las escrituras que lleguen
+mientras corre pueden quedar fuera, así que conviene correrlo sin tráfico de
+escritura. top_potencia no se toca; el consumidor lo recalcula en la próxima
+escritura de cada tipo.
+
+Uso:
+    python scripts/rebuild_stats.py --dry-run
+    python scripts/rebuild_stats.py --segments 4 --endpoint-url http://localhost:8000
+"""
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def aggregate(pages, stats):
+    """{tipo: contadores} de todos los carros de las páginas."""
+    by_tipo = {}
+    for page in pages:
+        for car in page:
+            counters = by_tipo.setdefault(car.get('tipo'), dict.fromkeys(stats.COUNTERS, 0))
+            counters['count'] += 1
+            counters['sum_potencia'] += stats.number_or_zero(car.get('potencia'))
+            counters['sum_capacidad'] += stats.number_or_zero(car.get('capacidad'))
+    by_tipo.pop(None, None)
+    return by_tipo
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--segments', type=int, default=1, help='TotalSegments del scan')
+    parser.add_argument('--dry-run', action='store_true', help='muestra los contadores sin escribirlos')
+    parser.add_argument('--table', default=os.environ.get('TABLE_NAME', 'CarsTable'))
+    parser.add_argument('--region', default=os.environ.get('AWS_DEFAULT_REGION', 'us-east-1'))
+    parser.add_argument('--endpoint-url', help='por ejemplo http://localhost:8000 para DynamoDB Local')
+    args = parser.parse_args(argv)
+
+    # cars_common.db crea su cliente al importarse y necesita una región
+    os.environ.setdefault('AWS_DEFAULT_REGION', args.region)
+    handler = logging.StreamHandler()
+    handler.setLevel(logging.WARNING)
+    logging.basicConfig(handlers=[handler])
+    sys.path[:0] = [str(ROOT / 'layers' / 'common')]
+    from cars_common import schema, stats, version
+    from cars_common.db import Table, iter_scan_pages, make_client
+
+    client = make_client(endpoint_url=args.endpoint_url, region_name=args.region, max_pool_connections=args.segments)
+    table = Table(args.table, client)
+    meta = Table(version.META_TABLE_NAME, client)
+
+    projection = schema.projection([schema.KEY_FIELD] + list(stats.STATS_FIELDS))
+    by_tipo = aggregate(iter_scan_pages(table, args.segments, scan_kwargs=projection), stats)
+    for tipo, counters in sorted(by_tipo.items(), key=lambda entry: str(entry[0])):
+        print(f"{tipo}: {counters}", file=sys.stderr)
+    if args.dry_run:
+        return 0
+
+    # Los tipos registrados que ya no tienen carros quedan en cero
+    registered = meta.get_item(Key=stats.TIPOS_KEY).get('Item', {}).get('tipos', set())
+    for tipo in registered - set(by_tipo):
+        by_tipo[tipo] = dict.fromkeys(stats.COUNTERS, 0)
+    for tipo, counters in by_tipo.items():
+        # SET y no PutItem: el elemento también guarda top_potencia
+        meta.update_item(
+            Key=stats.stats_key(tipo),
+            UpdateExpression='SET ' + ', '.join(f'#{name} = :{name}' for name in stats.COUNTERS),
+            ExpressionAttributeNames={'#' + name: name for name in stats.COUNTERS},
+            ExpressionAttributeValues={':' + name: value for name, value in counters.items()}
+        )
+    tipos = {tipo for tipo in by_tipo if isinstance(tipo, str) and tipo}
+    if tipos:
+        meta.update_item(Key=stats.TIPOS_KEY, UpdateExpression='ADD tipos :tipos', ExpressionAttributeValues={':tipos': tipos})
+    print(f"Rebuilt stats for {len(by_tipo)} tipos", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
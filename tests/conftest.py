@@ -0,0 +1,135 @@
+"""Configuración común de las pruebas.
+
+Los módulos de los handlers y de la capa se importan como en Lambda (cada
+directorio en ``sys.path``) y las pruebas sustituyen el cliente de DynamoDB de
+cada ``Table`` por ``StubClient``: no hace falta red ni credenciales.
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from botocore.exceptions import ClientError
+
+ROOT = Path(__file__).resolve().parent.parent
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('CURSOR_SECRET', 'test-secret')
+for directory in ('layers/common', 'get_cars', 'car_views'):
+    sys.path.insert(0, str(ROOT / directory))
+
+from cars_common import db, stats, version  # noqa: E402
+
+
+class LambdaContext:
+    aws_request_id = 'test-request'
+    function_name = 'test-function'
+
+    def __init__(self, remaining_ms=60000):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining_ms
+
+
+def _names(params):
+    return params.get('ExpressionAttributeNames', {})
+
+
+def _clauses(expression, keyword):
+    """Pares (atributo, valor) de ``SET a = :v, b = :w`` o ``ADD a :v, b :w``."""
+    body = expression.split(keyword, 1)[1]
+    pairs = []
+    for clause in body.split(','):
+        parts = clause.replace('=', ' ').split()
+        pairs.append((parts[0], parts[1]))
+    return pairs
+
+
+class StubClient:
+    """Cliente de DynamoDB de bajo nivel en memoria, con lo que usan car_views y cars_common.
+
+    Guarda los elementos con sus tipos de DynamoDB ({'S': ...}, {'N': ...}) por
+    tabla y clave, como los devolvería el servicio. Solo entiende las expresiones
+    que escribe este repositorio: ``SET x = :v``, ``ADD x :v`` y la condición de
+    la marca applied#<id> de car_views.
+    """
+
+    def __init__(self, key_name='pk'):
+        self.key_name = key_name
+        self.tables = {}
+        self.calls = []
+
+    def _items(self, table_name):
+        return self.tables.setdefault(table_name, {})
+
+    def _key(self, key):
+        return db.deserialize(key[self.key_name])
+
+    def get(self, table_name, key):
+        item = self._items(table_name).get(key)
+        return db.deserialize_item(item) if item else None
+
+    def get_item(self, TableName, Key, **kwargs):
+        self.calls.append('get_item')
+        item = self._items(TableName).get(self._key(Key))
+        return {'Item': item} if item else {}
+
+    def put_item(self, TableName, Item, **kwargs):
+        self.calls.append('put_item')
+        self._items(TableName)[self._key(Item)] = dict(Item)
+        return {}
+
+    def update_item(self, TableName, Key, UpdateExpression, ReturnValues=None, **params):
+        self.calls.append('update_item')
+        item = self._update(TableName, Key, UpdateExpression, params)
+        return {'Attributes': item} if ReturnValues else {}
+
+    def query(self, TableName, **kwargs):
+        self.calls.append('query')
+        return {'Items': [], 'Count': 0}
+
+    def transact_write_items(self, TransactItems):
+        self.calls.append('transact_write_items')
+        for position, action in enumerate(TransactItems):
+            params = action['Update']
+            if 'ConditionExpression' in params and not self._marker_condition(params):
+                reasons = [{'Code': 'None'}] * len(TransactItems)
+                reasons[position] = {'Code': 'ConditionalCheckFailed'}
+                raise ClientError(
+                    {'Error': {'Code': 'TransactionCanceledException'}, 'CancellationReasons': reasons},
+                    'TransactWriteItems'
+                )
+        for action in TransactItems:
+            params = dict(action['Update'])
+            self._update(params.pop('TableName'), params.pop('Key'), params.pop('UpdateExpression'), params)
+        return {}
+
+    def _marker_condition(self, params):
+        # attribute_not_exists(#seq) OR #seq < :seq
+        stored = self._items(params['TableName']).get(self._key(params['Key']), {}).get('seq')
+        return stored is None or stored['S'] < params['ExpressionAttributeValues'][':seq']['S']
+
+    def _update(self, table_name, key, expression, params):
+        item = self._items(table_name).setdefault(self._key(key), dict(key))
+        names, values = _names(params), params.get('ExpressionAttributeValues', {})
+        keyword = 'SET' if expression.startswith('SET') else 'ADD'
+        for attribute, placeholder in _clauses(expression, keyword):
+            attribute, value = names.get(attribute, attribute), values[placeholder]
+            if keyword == 'SET' or attribute not in item:
+                item[attribute] = value
+            elif 'N' in value:
+                item[attribute] = db.serialize(db.deserialize(item[attribute]) + db.deserialize(value))
+            else:
+                item[attribute] = db.serialize(db.deserialize(item[attribute]) | db.deserialize(value))
+        return item
+
+
+@pytest.fixture
+def meta_client(monkeypatch):
+    """StubClient para CarsMetaTable (contadores, marcas, feed) y también para CarsTable."""
+    client = StubClient()
+    monkeypatch.setattr(version.meta_table, 'client', client)
+    monkeypatch.setattr(db.table, 'client', client)
+    monkeypatch.setattr(stats, '_registered_tipos', set())
+    return client
@@ -0,0 +1,80 @@
+from decimal import Decimal
+
+import car_views
+from cars_common import db
+from conftest import LambdaContext
+
+META = 'CarsMetaTable'
+
+
+def record(sequence_number, old_car=None, new_car=None):
+    car_id = (new_car or old_car)['id']
+    change = {'Keys': {'id': {'S': car_id}}, 'SequenceNumber': sequence_number}
+    if old_car is not None:
+        change['OldImage'] = db.serialize_item(old_car)
+    if new_car is not None:
+        change['NewImage'] = db.serialize_item(new_car)
+    return {'eventName': 'MODIFY' if old_car and new_car else 'INSERT' if new_car else 'REMOVE', 'dynamodb': change}
+
+
+def counters(client, tipo):
+    item = client.get(META, 'stats#' + tipo) or {}
+    return {name: item.get(name, 0) for name in ('count', 'sum_potencia', 'sum_capacidad')}
+
+
+CIVIC = {'id': 'car-1', 'nombre': 'Civic', 'tipo': 'Sedan', 'potencia': 158, 'capacidad': 5}
+CRV = {'id': 'car-2', 'nombre': 'CR-V', 'tipo': 'SUV', 'potencia': Decimal('190.5'), 'capacidad': 5}
+
+
+def test_batch_applies_counters_and_views(meta_client):
+    records = [record('100', new_car=CIVIC), record('200', new_car=CRV)]
+    response = car_views.lambda_handler({'Records': records}, LambdaContext())
+
+    assert response == {'batchItemFailures': []}
+    assert counters(meta_client, 'Sedan') == {'count': 1, 'sum_potencia': 158, 'sum_capacidad': 5}
+    assert counters(meta_client, 'SUV') == {'count': 1, 'sum_potencia': Decimal('190.5'), 'sum_capacidad': 5}
+    assert meta_client.get(META, 'stats#SUV')['top_potencia'] == [
+        {'id': 'car-2', 'nombre': 'CR-V', 'potencia': Decimal('190.5')}
+    ]
+    assert meta_client.get(META, 'change#1')['changes'] == [
+        {'id': 'car-1', 'nombre': 'Civic'}, {'id': 'car-2', 'nombre': 'CR-V'}
+    ]
+
+
+def test_redelivered_batch_does_not_count_twice(meta_client):
+    records = [record('100', new_car=CIVIC), record('200', new_car=CRV)]
+    car_views.lambda_handler({'Records': records}, LambdaContext())
+    # Lambda vuelve a entregar el lote (p. ej. tras un fallo en las vistas)
+    response = car_views.lambda_handler({'Records': records}, LambdaContext())
+
+    assert response == {'batchItemFailures': []}
+    assert counters(meta_client, 'Sedan')['count'] == 1
+    assert counters(meta_client, 'SUV')['count'] == 1
+
+
+def test_partially_applied_batch_resumes(meta_client):
+    first = record('100', new_car=CIVIC)
+    car_views.lambda_handler({'Records': [first]}, LambdaContext())
+    update = record('300', old_car=CIVIC, new_car=dict(CIVIC, potencia=180))
+    car_views.lambda_handler({'Records': [first, update]}, LambdaContext())
+
+    assert counters(meta_client, 'Sedan') == {'count': 1, 'sum_potencia': 180, 'sum_capacidad': 5}
+
+
+def test_sequence_numbers_compare_numerically(meta_client):
+    # '1000' < '999' como texto: la marca guarda los SequenceNumber con ceros a la izquierda
+    car_views.lambda_handler({'Records': [record('999', new_car=CIVIC)]}, LambdaContext())
+    car_views.lambda_handler({'Records': [record('1000', old_car=CIVIC, new_car=None)]}, LambdaContext())
+
+    assert counters(meta_client, 'Sedan')['count'] == 0
+
+
+def test_failed_record_is_reported_for_redelivery(meta_client, monkeypatch):
+    def fail(actions):
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(car_views, 'transact_write', fail)
+    records = [record('100', new_car=CIVIC), record('200', new_car=CRV)]
+    response = car_views.lambda_handler({'Records': records}, LambdaContext())
+
+    assert response == {'batchItemFailures': [{'itemIdentifier': '100'}]}
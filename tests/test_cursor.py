@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+import pytest
+
+import get_cars
+
+
+@pytest.mark.parametrize('key', [
+    {'id': 'car-1'},
+    {'id': 'car-1', 'tipo': 'Sedan', 'potencia': 150},
+    {'id': 'car-1', 'tipo': 'Sedan', 'potencia': Decimal('12345678901234567.25')},
+])
+def test_cursor_round_trip(key):
+    assert get_cars.decode_cursor(get_cars.encode_cursor(key)) == key
+
+
+def test_cursor_keeps_range_key_exact():
+    # Un float de JSON redondearía la clave y la página siguiente repetiría o saltaría carros
+    key = {'id': 'car-1', 'tipo': 'Sedan', 'capacidad': Decimal('0.1000000000000000055511151231257827')}
+    start_key = get_cars.decode_cursor(get_cars.encode_cursor(key))
+    assert start_key['capacidad'] == key['capacidad']
+
+
+def test_tampered_payload_is_rejected():
+    payload, signature = get_cars.encode_cursor({'id': 'car-1'}).split('.')
+    forged = get_cars._b64encode(b'{"id":{"S":"car-2"}}')
+    with pytest.raises(ValueError, match='signature'):
+        get_cars.decode_cursor(forged + '.' + signature)
+
+
+def test_tampered_signature_is_rejected():
+    payload, signature = get_cars.encode_cursor({'id': 'car-1'}).split('.')
+    with pytest.raises(ValueError, match='signature'):
+        get_cars.decode_cursor(payload + '.' + get_cars._b64encode(b'\x00' * 16))
+
+
+@pytest.mark.parametrize('cursor', ['', 'abc', 'a.b.c', '!!!.???'])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        get_cars.decode_cursor(cursor)
+
+
+def test_signed_cursor_with_untyped_key_is_rejected():
+    # Cursores anteriores a las claves con tipos: firma válida, contenido no
+    payload = b'{"id":"car-1"}'
+    cursor = get_cars._b64encode(payload) + '.' + get_cars._b64encode(get_cars._sign(payload))
+    with pytest.raises(ValueError, match='Malformed'):
+        get_cars.decode_cursor(cursor)
+
+
+def test_cursor_requires_secret(monkeypatch):
+    monkeypatch.setattr(get_cars, 'CURSOR_SECRET', '')
+    with pytest.raises(RuntimeError):
+        get_cars.encode_cursor({'id': 'car-1'})
@@ -0,0 +1,117 @@
+from decimal import Decimal
+
+import pytest
+
+from cars_common import db, encoding
+
+
+@pytest.mark.parametrize('value', [
+    'Sedan',
+    '',
+    0,
+    -42,
+    10 ** 30,
+    -(2 ** 70),
+    Decimal('1.5'),
+    Decimal('12345678901234567890.123456789012345678'),
+    Decimal('1E-130'),
+    True,
+    None,
+    b'\x00\x01',
+    [1, 'a', [Decimal('0.1')]],
+    {'nested': {'potencia': 150}},
+    {'a', 'b'},
+    {1, 2},
+])
+def test_round_trip(value):
+    assert db.deserialize(db.serialize(value)) == value
+
+
+def test_integers_deserialize_to_int():
+    assert db.deserialize({'N': '150'}) == 150
+    assert type(db.deserialize({'N': '150'})) is int
+    assert db.deserialize({'N': '123456789012345678901234567890'}) == 123456789012345678901234567890
+
+
+def test_fractional_numbers_are_not_rounded():
+    # Con float, 17 o más dígitos significativos se redondeaban al reescribir el elemento
+    attribute = {'N': '12345678901234567.25'}
+    value = db.deserialize(attribute)
+    assert value == Decimal('12345678901234567.25')
+    assert db.serialize(value) == attribute
+
+
+def test_item_round_trip():
+    item = {'id': 'car-1', 'nombre': 'Civic', 'tipo': 'Sedan', 'potencia': Decimal('158.5'), 'capacidad': 5}
+    assert db.deserialize_item(db.serialize_item(item)) == item
+
+
+def test_dumps_integers_beyond_64_bits():
+    # orjson no serializa enteros de más de 64 bits; DynamoDB guarda hasta 38 dígitos
+    body = encoding.dumps({'potencia': 2 ** 70, 'capacidad': Decimal(10 ** 37)}, sort_keys=True)
+    assert body == '{"capacidad":%d,"potencia":%d}' % (10 ** 37, 2 ** 70)
+
+
+def test_dumps_decimal_and_sets():
+    assert encoding.dumps({'b': Decimal('1.5'), 'a': Decimal('2'), 'c': {3, 1}}, sort_keys=True) == \
+        '{"a":2,"b":1.5,"c":[1,3]}'
+
+
+class BatchClient:
+    """BatchGetItem/BatchWriteItem que dejan sin procesar lo indicado en cada llamada."""
+
+    def __init__(self, unprocessed_per_call):
+        self.unprocessed_per_call = list(unprocessed_per_call)
+        self.requests = []
+
+    def _leftover(self):
+        return self.unprocessed_per_call.pop(0) if self.unprocessed_per_call else 0
+
+    def batch_write_item(self, RequestItems):
+        (name, requests), = RequestItems.items()
+        self.requests.append(requests)
+        leftover = self._leftover()
+        return {'UnprocessedItems': {name: requests[len(requests) - leftover:]} if leftover else {}}
+
+    def batch_get_item(self, RequestItems):
+        (name, request), = RequestItems.items()
+        self.requests.append(request)
+        keys = request['Keys']
+        leftover = self._leftover()
+        processed, unprocessed = keys[:len(keys) - leftover], keys[len(keys) - leftover:]
+        response = {'Responses': {name: [dict(key, nombre={'S': 'car'}) for key in processed]}}
+        if unprocessed:
+            response['UnprocessedKeys'] = {name: dict(request, Keys=unprocessed)}
+        return response
+
+
+def test_batch_put_returns_the_original_items():
+    items = [{'id': f'car-{i}', 'potencia': Decimal('100.123456789012345678')} for i in range(3)]
+    table = db.Table('CarsTable', BatchClient([2]))
+    unprocessed = table.batch_put(items)
+    assert [item['id'] for item in unprocessed] == ['car-1', 'car-2']
+    assert all(item is original for item, original in zip(unprocessed, items[1:]))
+
+
+def test_batch_put_without_unprocessed_items():
+    assert db.Table('CarsTable', BatchClient([])).batch_put([{'id': 'car-1'}]) == []
+
+
+def test_batch_get_all_retries_unprocessed_keys(monkeypatch):
+    monkeypatch.setattr(db, 'BATCH_BASE_DELAY', 0)
+    client = BatchClient([40, 10, 0])
+    keys = [{'id': f'car-{i}'} for i in range(150)]
+    items = db.Table('CarsTable', client).batch_get_all(keys, ConsistentRead=True)
+    assert sorted(item['id'] for item in items) == sorted(key['id'] for key in keys)
+    # 100 claves, sus 40 sin procesar, sus 10 sin procesar y luego las 50 restantes
+    assert [len(request['Keys']) for request in client.requests] == [100, 40, 10, 50]
+    assert all(request['ConsistentRead'] for request in client.requests)
+
+
+def test_batch_get_all_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(db, 'BATCH_BASE_DELAY', 0)
+    monkeypatch.setattr(db, 'BATCH_MAX_RETRIES', 2)
+    client = BatchClient([1] * 10)
+    with pytest.raises(RuntimeError):
+        db.Table('CarsTable', client).batch_get_all([{'id': 'car-1'}])
+    assert len(client.requests) == 3
@@ -0,0 +1,56 @@
+import search_cars
+from search_cars import NameIndex
+
+CARS = [
+    {'id': 'car-1', 'nombre': 'Toyota Corolla'},
+    {'id': 'car-2', 'nombre': 'Toyota Camry'},
+    {'id': 'car-3', 'nombre': 'Honda Civic'},
+    {'id': 'car-4', 'nombre': 'Ford Focus'},
+]
+
+
+def test_prefix():
+    index = NameIndex(CARS, 1)
+    assert [car['id'] for car in index.prefix('toyota', 10)] == ['car-2', 'car-1']
+    assert index.prefix('toyota', 1) == [{'id': 'car-2', 'nombre': 'Toyota Camry'}]
+
+
+def test_fuzzy_tolerates_typos():
+    index = NameIndex(CARS, 1)
+    results = index.fuzzy('Honda Civc', 5)
+    assert results[0]['id'] == 'car-3'
+    assert 0 < results[0]['score'] <= 1
+
+
+def test_remove_drops_every_trace():
+    index = NameIndex(CARS, 1)
+    index._remove('car-3')
+    assert len(index) == 3
+    assert index.prefix('honda', 10) == []
+    assert index.fuzzy('Honda Civic', 10) == []
+    assert all('car-3' not in ids for ids in index._postings.values())
+    # Quitar un id que no está no hace nada
+    index._remove('car-3')
+    assert len(index) == 3
+
+
+def test_apply_is_idempotent():
+    index = NameIndex(CARS, 1)
+    changes = [{'id': 'car-4', 'nombre': 'Ford Fiesta'}, {'id': 'car-1', 'deleted': True}]
+    index.apply(changes)
+    index.apply(changes)
+    assert len(index) == 3
+    assert index.prefix('ford', 10) == [{'id': 'car-4', 'nombre': 'Ford Fiesta'}]
+    assert index._sorted == sorted(index._sorted)
+
+
+def test_refresh_waits_for_a_missing_feed_entry(monkeypatch):
+    index = NameIndex(CARS, 1)
+    monkeypatch.setattr(search_cars.version, 'feed_position', lambda: 3)
+    monkeypatch.setattr(search_cars.version, 'read_changes', lambda since, until: {
+        2: {'changes': [{'id': 'car-5', 'nombre': 'Mazda 3'}]},
+    })
+    assert search_cars.refresh(index) is index
+    assert index.version == 2
+    assert index.gap_since is not None
+    assert index.prefix('mazda', 10) == [{'id': 'car-5', 'nombre': 'Mazda 3'}]
@@ -1,58 +1,52 @@
 import json
-import boto3
-import logging
 from botocore.exceptions import ClientError
 
-# Configura el logger
-logger = logging.getLogger()
-logger.setLevel(logging.DEBUG)
-
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table('CarsTable')
-common_headers = {
-    'Access-Control-Allow-Headers': '*',
-    'Access-Control-Allow-Origin': '*',
-    'Access-Control-Allow-Methods': 'OPTIONS,POST,GET,PUT,DELETE'
-}
+from cars_common import deadline, http, log, responses, schema, version
+from cars_common.db import table
+
+# Logger JSON; el nivel sale de LOG_LEVEL
+logger = log.get_logger()
+
+
+@deadline.bounded
+@log.sampled
 def lambda_handler(event, context):
     try:
-        logger.debug("Received event: %s", json.dumps(event))
+        logger.debug("Received event: %s", event)
 
         # Obtener el ID del carro desde los parámetros de la ruta
-        car_id = event.get('pathParameters', {}).get('id')
+        car_id = (event.get('pathParameters') or {}).get('id')
         logger.debug("Car ID: %s", car_id)
 
         if not car_id:
             logger.warning("Missing path parameter: ID is required")
-            return {
-                'statusCode': 400,
-                'body': json.dumps({'error': 'Missing path parameter', 'details': 'ID is required'}),
-                'headers': common_headers
-            }
+            return responses.raw(400, responses.MISSING_ID)
 
         # Obtener el cuerpo de la solicitud
-        body = json.loads(event.get('body', '{}'))
+        body = json.loads(http.request_body(event))
         logger.debug("Request body: %s", body)
 
         # Verificar que todos los campos requeridos estén presentes
-        required_fields = ['nombre', 'tipo', 'potencia', 'capacidad']
-        missing_fields = [field for field in required_fields if field not in body]
+        missing_fields = [field for field in schema.CAR_FIELDS if field not in body]
 
         if missing_fields:
             logger.warning("Missing required fields: %s", ', '.join(missing_fields))
-            return {
-                'statusCode': 400,
-                'body': json.dumps({'error': 'Missing required fields', 'details': ', '.join(missing_fields)}),
-                'headers': common_headers
-            }
+            return responses.error(400, 'Missing required fields', ', '.join(missing_fields))
+
+        # potencia y capacidad se guardan como números, igual que en POST /car
+        try:
+            car = schema.normalize_car(body)
+        except ValueError as e:
+            logger.warning("Invalid field value: %s", e)
+            return responses.error(400, 'Invalid field value', str(e))
 
         # Preparar la expresión de actualización y los valores de atributos
         update_expression = "set "
         expression_attribute_values = {
-            ':n': body['nombre'],
-            ':t': body['tipo'],
-            ':p': body['potencia'],
-            ':c': body['capacidad']
+            ':n': car['nombre'],
+            ':t': car['tipo'],
+            ':p': car['potencia'],
+            ':c': car['capacidad']
         }
 
         update_expression += "nombre = :n, tipo = :t, potencia = :p, capacidad = :c"
@@ -65,34 +59,19 @@ def lambda_handler(event, context):
             UpdateExpression=update_expression,
             ExpressionAttributeValues=expression_attribute_values
         )
+        version.bump()
 
         logger.info("Car updated successfully")
-        return {
-            'statusCode': 200,
-            'body': json.dumps({'message': 'Carro actualizado correctamente'}),
-            'headers': common_headers
-        }
+        return responses.raw(200, responses.CAR_UPDATED)
 
     except json.JSONDecodeError as e:
         logger.error("JSON Decode Error: %s", e)
-        return {
-            'statusCode': 400,
-            'body': json.dumps({'error': 'Invalid JSON format', 'details': str(e)}),
-            'headers': common_headers
-        }
+        return responses.error(400, 'Invalid JSON format', str(e))
 
     except ClientError as e:
         logger.error("DynamoDB ClientError: %s", e)
-        return {
-            'statusCode': 500,
-            'body': json.dumps({'error': 'DynamoDB error', 'details': str(e)}),
-            'headers': common_headers
-        }
+        return responses.client_error(e)
 
     except Exception as e:
         logger.error("Unexpected error: %s", e)
-        return {
-            'statusCode': 500,
-            'body': json.dumps({'error': 'Internal server error', 'details': str(e)}),
-            'headers': common_headers
-        }
\ No newline at end of file
+        return responses.internal_error(e)